@@ -2,6 +2,7 @@
 # with a vacuum probe.
 
 import numpy as np
+from scipy.fft import fft2, ifft2
 from scipy.ndimage import gaussian_filter
 
 from emdfile import tqdmnd
@@ -328,21 +329,26 @@ def _find_Bragg_disks_single(
     maxNumPeaks=100,
     _return_cc=False,
     _template_space="real",
+    _cc_FT=None,
 ):
     # apply filter function
     er = "filter_function must be callable"
     if filter_function:
         assert callable(filter_function), er
-    DP = DP if filter_function is None else filter_function(DP)
+    if _cc_FT is None:
+        DP = DP if filter_function is None else filter_function(DP)
 
     # check for a template
-    if template is None:
+    if _cc_FT is not None:
+        # cross correlation precomputed, e.g. in a batch
+        cc = _cc_FT
+    elif template is None:
         cc = DP
     else:
         # fourier transform the template
         assert _template_space in ("real", "fourier")
         if _template_space == "real":
-            template_FT = np.conj(np.fft.fft2(template))
+            template_FT = np.conj(fft2(template))
         else:
             template_FT = template
 
@@ -361,7 +367,7 @@ def _find_Bragg_disks_single(
 
     # Get maxima
     maxima = get_maxima_2D(
-        np.maximum(np.real(np.fft.ifft2(cc)), 0),
+        np.maximum(np.real(ifft2(cc)), 0),
         subpixel=subpixel,
         upsample_factor=upsample_factor,
         sigma=sigma_cc,
@@ -401,6 +407,36 @@ def _find_Bragg_disks_single(
 #    return cc
 
 
+# Batched cross correlations
+
+
+def _get_cross_correlations_FT(
+    dps,
+    template_FT,
+    filter_function=None,
+    corrPower=1,
+    sigma_dp=0,
+):
+    """
+    Computes the Fourier space cross correlations of a sequence of diffraction
+    patterns `dps` with `template_FT`, applying any filter function and smoothing
+    to each pattern first, with a single batched and multithreaded FFT over the
+    stack.
+    """
+    if filter_function is not None:
+        dps = [filter_function(dp) for dp in dps]
+    if sigma_dp > 0:
+        dps = [gaussian_filter(dp, sigma_dp) for dp in dps]
+
+    return get_cross_correlation_FT(
+        np.stack(dps),
+        template_FT,
+        corrPower,
+        "fourier",
+        workers=-1,
+    )
+
+
 # 3D stack of DPs
 
 
@@ -423,8 +459,29 @@ def _find_Bragg_disks_stack(
 ):
     ans = []
 
+    # compute the cross correlations in batches
+    batch_size = 32
+    if template is not None:
+        assert _template_space in ("real", "fourier")
+        if _template_space == "real":
+            template = np.conj(fft2(template))
+            _template_space = "fourier"
+
     for idx in range(dp_stack.shape[0]):
-        dp = dp_stack[idx, :, :]
+        # with a template, the pattern is only read for its batched cross correlation
+        if template is None:
+            dp, cc = dp_stack[idx, :, :], None
+        else:
+            if idx % batch_size == 0:
+                cc_batch = _get_cross_correlations_FT(
+                    dp_stack[idx : idx + batch_size],
+                    template,
+                    filter_function=filter_function,
+                    corrPower=corrPower,
+                    sigma_dp=sigma_dp,
+                )
+            dp, cc = None, cc_batch[idx % batch_size]
+
         peaks = _find_Bragg_disks_single(
             dp,
             template,
@@ -442,6 +499,7 @@ def _find_Bragg_disks_stack(
             maxNumPeaks=maxNumPeaks,
             _template_space=_template_space,
             _return_cc=False,
+            _cc_FT=cc,
         )
         ans.append(peaks)
 
@@ -472,7 +530,19 @@ def _find_Bragg_disks_CPU(
     braggvectors = BraggVectors(datacube.Rshape, datacube.Qshape)
 
     # Get the template's Fourier Transform
-    probe_kernel_FT = np.conj(np.fft.fft2(probe)) if probe is not None else None
+    probe_kernel_FT = np.conj(fft2(probe)) if probe is not None else None
+
+    # Get a diffraction pattern
+    def get_dp(rx, ry):
+        # without background subtraction
+        if not radial_bksb:
+            return datacube.data[rx, ry, :, :]
+        # and with
+        else:
+            return datacube.get_radial_bksb_dp(rx, ry)
+
+    # Cross correlations are computed in batches along each scan row
+    batch_size = 32
 
     # Loop over all diffraction patterns
     # Compute and populate BraggVectors data
@@ -483,14 +553,22 @@ def _find_Bragg_disks_CPU(
         unit="DP",
         unit_scale=True,
     ):
-        # Get a diffraction pattern
-
-        # without background subtraction
-        if not radial_bksb:
-            dp = datacube.data[rx, ry, :, :]
-        # and with
+        # with a probe, each pattern is read once, for its batched cross correlation
+        if probe_kernel_FT is None:
+            dp, cc = get_dp(rx, ry), None
         else:
-            dp = datacube.get_radial_bksb_dp(rx, ry)
+            if ry % batch_size == 0:
+                cc_batch = _get_cross_correlations_FT(
+                    [
+                        get_dp(rx, ry_)
+                        for ry_ in range(ry, min(ry + batch_size, datacube.R_Ny))
+                    ],
+                    probe_kernel_FT,
+                    filter_function=filter_function,
+                    corrPower=corrPower,
+                    sigma_dp=sigma_dp,
+                )
+            dp, cc = None, cc_batch[ry % batch_size]
 
         # Compute
         peaks = _find_Bragg_disks_single(
@@ -510,6 +588,7 @@ def _find_Bragg_disks_CPU(
             maxNumPeaks=maxNumPeaks,
             _return_cc=False,
             _template_space="fourier",
+            _cc_FT=cc,
         )
 
         # Populate data
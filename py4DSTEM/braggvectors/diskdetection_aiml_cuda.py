@@ -503,7 +503,7 @@ def get_maxima_2D_cp(
                     ) < minSpacing**2
                     tooClose[: i + 1] = False
                     deletemask[tooClose] = True
-            maxima = np.delete(maxima, np.nonzero(deletemask)[0])
+            maxima = maxima[~deletemask]
 
         # Remove maxima which are too dim
         if (minRelativeIntensity > 0) & (len(maxima) > relativeToPeak):
@@ -512,12 +512,12 @@ def get_maxima_2D_cp(
                 maxima["intensity"] / maxima["intensity"][relativeToPeak]
                 < minRelativeIntensity
             )
-            maxima = np.delete(maxima, np.nonzero(deletemask)[0])
+            maxima = maxima[~deletemask]
 
         # Remove maxima which are too dim, absolute scale
         if minAbsoluteIntensity > 0:
             deletemask = maxima["intensity"] < minAbsoluteIntensity
-            maxima = np.delete(maxima, np.nonzero(deletemask)[0])
+            maxima = maxima[~deletemask]
 
         # Remove maxima in excess of maxNumPeaks
         if maxNumPeaks > 0:
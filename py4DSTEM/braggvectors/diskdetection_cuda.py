@@ -14,6 +14,7 @@ import numba
 from emdfile import tqdmnd
 from py4DSTEM import PointList, PointListArray
 from py4DSTEM.braggvectors.kernels import kernels
+from py4DSTEM.process.utils.cross_correlate import _apply_correlation_power
 
 
 def find_Bragg_disks_CUDA(
@@ -176,7 +177,7 @@ def find_Bragg_disks_CUDA(
                 rx, ry = np.unravel_index(patt_idx, (datacube.R_Nx, datacube.R_Ny))
 
                 subFFT = batched_crosscorr[subbatch_idx]
-                ccc = cp.abs(subFFT) ** corrPower * cp.exp(1j * cp.angle(subFFT))
+                ccc = _apply_correlation_power(subFFT, corrPower)
                 cc = cp.maximum(cp.real(cp.fft.ifft2(ccc)), 0)
 
                 _find_Bragg_disks_single_DP_FK_CUDA(
@@ -390,7 +391,7 @@ def get_cross_correlation_fk(ar, fourierkernel, corrPower=1, returnval="cc"):
         inverse transform.
     """
     m = cp.fft.fft2(ar) * fourierkernel
-    ccc = cp.abs(m) ** (corrPower) * cp.exp(1j * cp.angle(m))
+    ccc = _apply_correlation_power(m, corrPower)
     if returnval == "fourier":
         return ccc
     else:
@@ -492,7 +493,7 @@ def get_maxima_2D(
                     ) < minSpacing**2
                     tooClose[: i + 1] = False
                     deletemask[tooClose] = True
-            maxima = np.delete(maxima, np.nonzero(deletemask)[0])
+            maxima = maxima[~deletemask]
 
         # Remove maxima which are too dim
         if (minRelativeIntensity > 0) & (len(maxima) > relativeToPeak):
@@ -500,12 +501,12 @@ def get_maxima_2D(
                 maxima["intensity"] / maxima["intensity"][relativeToPeak]
                 < minRelativeIntensity
             )
-            maxima = np.delete(maxima, np.nonzero(deletemask)[0])
+            maxima = maxima[~deletemask]
 
         # Remove maxima which are too dim, absolute scale
         if minAbsoluteIntensity > 0:
             deletemask = maxima["intensity"] < minAbsoluteIntensity
-            maxima = np.delete(maxima, np.nonzero(deletemask)[0])
+            maxima = maxima[~deletemask]
 
         # Remove maxima in excess of maxNumPeaks
         if maxNumPeaks is not None and maxNumPeaks > 0:
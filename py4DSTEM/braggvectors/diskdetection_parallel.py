@@ -106,6 +106,7 @@ def _find_Bragg_disks_single_DP_FK(
     import numpy
     import scipy.ndimage.filters
     import py4DSTEM.process.utils.multicorr
+    from py4DSTEM.process.utils.cross_correlate import _apply_correlation_power
 
     # apply filter function:
     DP = DP if filter_function is None else filter_function(DP)
@@ -145,7 +146,7 @@ def _find_Bragg_disks_single_DP_FK(
     else:
         # Multicorr subpixel:
         m = numpy.fft.fft2(DP) * probe_kernel_FT
-        ccc = numpy.abs(m) ** corrPower * numpy.exp(1j * numpy.angle(m))
+        ccc = _apply_correlation_power(m, corrPower)
 
         cc = numpy.maximum(numpy.real(numpy.fft.ifft2(ccc)), 0)
 
@@ -12,6 +12,12 @@ from emdfile import tqdmnd, Metadata
 from py4DSTEM.data import Calibration, RealSlice, Data, DiffractionSlice
 from py4DSTEM.preprocess import get_shifted_ar
 from py4DSTEM.visualize import show
+from py4DSTEM.utils.numba_utils import _as_native, _numba_supports
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
 
 
 # Virtual image container class
@@ -58,6 +64,24 @@ class VirtualImage(RealSlice, Data):
         return args
 
 
+if njit is not None:
+
+    @njit(parallel=True, nogil=True, cache=True)
+    def _apply_mask(data, mask, virtual_image):
+        """
+        Sums each diffraction pattern in the 4D array `data`, weighted by the
+        2D `mask`, into the real-space shaped `virtual_image`.
+        """
+        R_Nx, R_Ny, Q_Nx, Q_Ny = data.shape
+        for rx in prange(R_Nx):
+            for ry in range(R_Ny):
+                val = 0.0
+                for qx in range(Q_Nx):
+                    for qy in range(Q_Ny):
+                        val += data[rx, ry, qx, qy] * mask[qx, qy]
+                virtual_image[rx, ry] = val
+
+
 # DataCube virtual imaging methods
 
 
@@ -210,13 +234,46 @@ class DataCubeVirtualImager:
                     virtual_image = np.zeros(self.Rshape, dtype="complex")
                 else:
                     virtual_image = np.zeros(self.Rshape)
+                # crop to the detector's bounding box, so the cost of each
+                # pattern scales with the detector size, not the pattern size
+                qx, qy = np.nonzero(mask)
+                if len(qx) > 0:
+                    slx = slice(qx.min(), qx.max() + 1)
+                    sly = slice(qy.min(), qy.max() + 1)
+                else:
+                    slx = sly = slice(0, 0)
+                _mask = mask[slx, sly]
                 # compute
-                for rx, ry in tqdmnd(
-                    self.R_Nx,
-                    self.R_Ny,
-                    disable=not verbose,
+                if (
+                    njit is not None
+                    and isinstance(self.data, np.ndarray)
+                    and self.data.dtype.kind in "biuf"
+                    and mask.dtype != "complex"
                 ):
-                    virtual_image[rx, ry] = np.sum(self.data[rx, ry] * mask)
+                    if _numba_supports(self.data.dtype):
+                        _apply_mask(
+                            self.data[:, :, slx, sly],
+                            _mask.astype(np.float64),
+                            virtual_image,
+                        )
+                    else:
+                        # big-endian (e.g. memory-mapped) and float16 data are
+                        # cast to a native dtype one scan row at a time
+                        for rx in range(self.R_Nx):
+                            _apply_mask(
+                                _as_native(self.data[rx : rx + 1, :, slx, sly]),
+                                _mask.astype(np.float64),
+                                virtual_image[rx : rx + 1],
+                            )
+                else:
+                    for rx, ry in tqdmnd(
+                        self.R_Nx,
+                        self.R_Ny,
+                        disable=not verbose,
+                    ):
+                        virtual_image[rx, ry] = np.sum(
+                            self.data[rx, ry, slx, sly] * _mask
+                        )
 
             # dask
             if dask:
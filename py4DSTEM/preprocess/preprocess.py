@@ -21,10 +21,8 @@ def set_scan_shape(datacube, R_Nx, R_Ny):
     Reshape the data given the real space scan shape.
     """
     try:
-        # reshape
-        datacube.data = datacube.data.reshape(
-            datacube.R_N, datacube.Q_Nx, datacube.Q_Ny
-        ).reshape(R_Nx, R_Ny, datacube.Q_Nx, datacube.Q_Ny)
+        # reshape; raises ValueError if the scan shape doesn't hold R_N positions
+        datacube.data = datacube.data.reshape(R_Nx, R_Ny, datacube.Q_Nx, datacube.Q_Ny)
 
         # set dim vectors
         Rpixsize = datacube.calibration.get_R_pixel_size()
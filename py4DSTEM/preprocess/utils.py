@@ -1,13 +1,24 @@
 # Preprocessing utility functions
 
+import functools
+
 import numpy as np
+import scipy.fft
 from scipy.ndimage import gaussian_filter
+from scipy.spatial import cKDTree
+
+from py4DSTEM.utils.numba_utils import _as_native, _numba_supports
 
 try:
     import cupy as cp
 except (ModuleNotFoundError, ImportError):
     cp = np
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 
 def bin2D(array, factor, dtype=np.float64):
     """
@@ -28,19 +39,49 @@ def bin2D(array, factor, dtype=np.float64):
 
     # Make a binned array on the device
     binned_ar = np.zeros((binx, biny), dtype=dtype)
-    array = array.astype(dtype)
 
-    # Collect pixel sums into new bins
+    # Collect pixel sums into new bins in a single pass
+    if (
+        njit is not None
+        and isinstance(array, np.ndarray)
+        and _numba_supports(binned_ar.dtype)
+        and np.can_cast(array.dtype, binned_ar.dtype)
+    ):
+        native = _as_native(array)
+        if _numba_supports(native.dtype):
+            return _bin2D(native, factor, binned_ar)
+
+    array = array.astype(dtype)
     for ix in range(factor):
         for iy in range(factor):
             binned_ar += array[0 + ix : xx + ix : factor, 0 + iy : yy + iy : factor]
     return binned_ar
 
 
+if njit is not None:
+
+    @njit(cache=True)
+    def _bin2D(array, factor, binned_ar):
+        """
+        Adds the factor x factor blocks of array to the pixels of binned_ar.
+        """
+        for i in range(binned_ar.shape[0]):
+            for ix in range(factor):
+                for j in range(binned_ar.shape[1]):
+                    val = binned_ar[i, j]
+                    for iy in range(factor):
+                        val += array[i * factor + ix, j * factor + iy]
+                    binned_ar[i, j] = val
+        return binned_ar
+
+
 def make_Fourier_coords2D(Nx, Ny, pixelSize=1):
     """
     Generates Fourier coordinates for a (Nx,Ny)-shaped 2D array.
         Specifying the pixelSize argument sets a unit size.
+
+    The coordinate arrays are read-only broadcast views of cached 1D frequency
+    vectors; callers which modify them in place must copy them first.
     """
     if hasattr(pixelSize, "__len__"):
         assert len(pixelSize) == 2, "pixelSize must either be a scalar or have length 2"
@@ -50,12 +91,18 @@ def make_Fourier_coords2D(Nx, Ny, pixelSize=1):
         pixelSize_x = pixelSize
         pixelSize_y = pixelSize
 
-    qx = np.fft.fftfreq(Nx, pixelSize_x)
-    qy = np.fft.fftfreq(Ny, pixelSize_y)
-    qy, qx = np.meshgrid(qy, qx)
+    qx = np.broadcast_to(_fftfreq(Nx, pixelSize_x)[:, None], (Nx, Ny))
+    qy = np.broadcast_to(_fftfreq(Ny, pixelSize_y)[None, :], (Nx, Ny))
     return qx, qy
 
 
+@functools.lru_cache(maxsize=16)
+def _fftfreq(N, pixelSize):
+    q = np.fft.fftfreq(N, pixelSize)
+    q.setflags(write=False)
+    return q
+
+
 def get_shifted_ar(ar, xshift, yshift, periodic=True, bilinear=False, device="cpu"):
     """
         Shifts array ar by the shift vector (xshift,yshift), using the either
@@ -74,21 +121,46 @@ def get_shifted_ar(ar, xshift, yshift, periodic=True, bilinear=False, device="cp
     """
     if device == "cpu":
         xp = np
+        xp_fft = scipy.fft
 
     elif device == "gpu":
         xp = cp
+        xp_fft = cp.fft
 
     ar = xp.asarray(ar)
 
     # Apply image shift
     if bilinear is False:
         nx, ny = xp.shape(ar)
-        qx, qy = make_Fourier_coords2D(nx, ny, 1)
-        qx = xp.asarray(qx)
-        qy = xp.asarray(qy)
 
-        w = xp.exp(-(2j * xp.pi) * ((yshift * qy) + (xshift * qx)))
-        shifted_ar = xp.real(xp.fft.ifft2((xp.fft.fft2(ar)) * w))
+        if xp.iscomplexobj(ar):
+            qx, qy = make_Fourier_coords2D(nx, ny, 1)
+            qx = xp.asarray(qx)
+            qy = xp.asarray(qy)
+
+            w = xp.exp(-(2j * xp.pi) * ((yshift * qy) + (xshift * qx)))
+            shifted_ar = xp.real(xp_fft.ifft2((xp_fft.fft2(ar)) * w))
+
+        else:
+            # real arrays only need the non-negative frequencies along y, and the
+            # phase ramp is separable
+            qx = xp.fft.fftfreq(nx)
+            qy = xp.fft.rfftfreq(ny)
+
+            ramp_x = xp.exp(-(2j * xp.pi) * xshift * qx)
+            ramp_y = xp.exp(-(2j * xp.pi) * yshift * qy)
+
+            # Nyquist frequencies of even sizes are shared by +/- shifts, and
+            # taking the real part of the shifted array applies cosines to them
+            if nx % 2 == 0:
+                ramp_x[nx // 2] = xp.cos(xp.pi * xshift)
+            if ny % 2 == 0:
+                ramp_y[-1] = xp.cos(xp.pi * yshift)
+
+            w = ramp_x[:, None] * ramp_y[None, :]
+            if nx % 2 == 0 and ny % 2 == 0:
+                w[nx // 2, -1] = xp.cos(xp.pi * (xshift + yshift))
+            shifted_ar = xp_fft.irfft2(xp_fft.rfft2(ar) * w, s=(nx, ny))
 
     else:
         xF = xp.floor(xshift).astype(int).item()
@@ -156,7 +228,7 @@ def get_maxima_2D(
     Returns:
         a structured array with fields 'x','y','intensity'
     """
-    from py4DSTEM.process.utils.multicorr import upsampled_correlation
+    from py4DSTEM.process.utils.multicorr import upsampled_correlation_batch
 
     subpixel_modes = ("pixel", "poly", "multicorr")
     er = f"Unrecognized subpixel option {subpixel}. Must be in {subpixel_modes}"
@@ -166,16 +238,8 @@ def get_maxima_2D(
     ar = ar if sigma <= 0 else gaussian_filter(ar, sigma)
 
     # local pixelwise maxima
-    maxima_bool = (
-        (ar >= np.roll(ar, (-1, 0), axis=(0, 1)))
-        & (ar > np.roll(ar, (1, 0), axis=(0, 1)))
-        & (ar >= np.roll(ar, (0, -1), axis=(0, 1)))
-        & (ar > np.roll(ar, (0, 1), axis=(0, 1)))
-        & (ar >= np.roll(ar, (-1, -1), axis=(0, 1)))
-        & (ar > np.roll(ar, (-1, 1), axis=(0, 1)))
-        & (ar >= np.roll(ar, (1, -1), axis=(0, 1)))
-        & (ar > np.roll(ar, (1, 1), axis=(0, 1)))
-    )
+    ar_native = _as_native(ar)
+    maxima_bool = _get_local_maxima(ar_native)
 
     # remove edges
     assert isinstance(edgeBoundary, (int, np.integer))
@@ -214,42 +278,146 @@ def get_maxima_2D(
         return maxima
 
     # Parabolic subpixel refinement
-    for i in range(len(maxima)):
-        Ix1_ = ar[int(maxima["x"][i]) - 1, int(maxima["y"][i])].astype(np.float64)
-        Ix0 = ar[int(maxima["x"][i]), int(maxima["y"][i])].astype(np.float64)
-        Ix1 = ar[int(maxima["x"][i]) + 1, int(maxima["y"][i])].astype(np.float64)
-        Iy1_ = ar[int(maxima["x"][i]), int(maxima["y"][i]) - 1].astype(np.float64)
-        Iy0 = ar[int(maxima["x"][i]), int(maxima["y"][i])].astype(np.float64)
-        Iy1 = ar[int(maxima["x"][i]), int(maxima["y"][i]) + 1].astype(np.float64)
-        deltax = (Ix1 - Ix1_) / (4 * Ix0 - 2 * Ix1 - 2 * Ix1_)
-        deltay = (Iy1 - Iy1_) / (4 * Iy0 - 2 * Iy1 - 2 * Iy1_)
-        maxima["x"][i] += deltax
-        maxima["y"][i] += deltay
-        maxima["intensity"][i] = linear_interpolation_2D(
-            ar, maxima["x"][i], maxima["y"][i]
-        )
+    x, y = maxima["x"].copy(), maxima["y"].copy()
+    intensity = np.empty(len(maxima))
+    _get_parabolic_subpixel_maxima(ar_native, x, y, intensity)
+    maxima["x"], maxima["y"], maxima["intensity"] = x, y, intensity
 
     if subpixel == "poly":
         return maxima
 
     # Fourier upsampling
     if _ar_FT is None:
-        _ar_FT = np.fft.fft2(ar)
-    for ipeak in range(len(maxima["x"])):
-        xyShift = np.array((maxima["x"][ipeak], maxima["y"][ipeak]))
-        # we actually have to lose some precision and go down to half-pixel
-        # accuracy for multicorr
-        xyShift[0] = np.round(xyShift[0] * 2) / 2
-        xyShift[1] = np.round(xyShift[1] * 2) / 2
-
-        subShift = upsampled_correlation(_ar_FT, upsample_factor, xyShift)
-        maxima["x"][ipeak] = subShift[0]
-        maxima["y"][ipeak] = subShift[1]
+        _ar_FT = scipy.fft.fft2(ar)
+    xyShifts = np.stack((maxima["x"], maxima["y"]), axis=1)
+    # we actually have to lose some precision and go down to half-pixel
+    # accuracy for multicorr
+    xyShifts = np.round(xyShifts * 2) / 2
+
+    subShifts = upsampled_correlation_batch(_ar_FT, upsample_factor, xyShifts)
+    maxima["x"] = subShifts[:, 0]
+    maxima["y"] = subShifts[:, 1]
 
     maxima = np.sort(maxima, order="intensity")[::-1]
     return maxima
 
 
+if njit is not None:
+
+    @njit(cache=True)
+    def _get_local_maxima(ar):
+        """
+        Returns a boolean mask of the local pixelwise maxima of the 2D array ar,
+        excluding its outermost pixels. Ties with the neighbors below/right of a
+        pixel are counted as maxima, and ties with those above/left are not.
+        """
+        nx, ny = ar.shape
+        maxima_bool = np.zeros((nx, ny), dtype=np.bool_)
+        for i in range(1, nx - 1):
+            for j in range(1, ny - 1):
+                v = ar[i, j]
+                maxima_bool[i, j] = (
+                    v >= ar[i + 1, j]
+                    and v > ar[i - 1, j]
+                    and v >= ar[i, j + 1]
+                    and v > ar[i, j - 1]
+                    and v >= ar[i + 1, j + 1]
+                    and v > ar[i + 1, j - 1]
+                    and v >= ar[i - 1, j + 1]
+                    and v > ar[i - 1, j - 1]
+                )
+        return maxima_bool
+
+else:
+
+    def _get_local_maxima(ar):
+        """
+        Returns a boolean mask of the local pixelwise maxima of the 2D array ar,
+        excluding its outermost pixels. Ties with the neighbors below/right of a
+        pixel are counted as maxima, and ties with those above/left are not.
+        """
+        maxima_bool = np.zeros(ar.shape, dtype=bool)
+        c = ar[1:-1, 1:-1]
+        m = maxima_bool[1:-1, 1:-1]
+        np.greater_equal(c, ar[2:, 1:-1], out=m)
+        m &= c > ar[:-2, 1:-1]
+        m &= c >= ar[1:-1, 2:]
+        m &= c > ar[1:-1, :-2]
+        m &= c >= ar[2:, 2:]
+        m &= c > ar[2:, :-2]
+        m &= c >= ar[:-2, 2:]
+        m &= c > ar[:-2, :-2]
+        return maxima_bool
+
+
+if njit is not None:
+
+    @njit(cache=True, error_model="numpy")
+    def _get_parabolic_subpixel_maxima(ar, x, y, intensity):
+        """
+        Refines the pixel maxima (x,y) of ar in-place by fitting parabolas along x
+        and y through each maximum and its neighbors, and sets intensity to the
+        linearly interpolated value of ar at the refined positions.
+        """
+        for i in range(x.shape[0]):
+            ix, iy = int(x[i]), int(y[i])
+            Ix1_ = np.float64(ar[ix - 1, iy])
+            Ix0 = np.float64(ar[ix, iy])
+            Ix1 = np.float64(ar[ix + 1, iy])
+            Iy1_ = np.float64(ar[ix, iy - 1])
+            Iy1 = np.float64(ar[ix, iy + 1])
+            deltax = (Ix1 - Ix1_) / (4 * Ix0 - 2 * Ix1 - 2 * Ix1_)
+            deltay = (Iy1 - Iy1_) / (4 * Ix0 - 2 * Iy1 - 2 * Iy1_)
+            # flat maxima are left at the pixel position
+            if np.isfinite(deltax):
+                x[i] += deltax
+            if np.isfinite(deltay):
+                y[i] += deltay
+
+            x0, x1 = int(np.floor(x[i])), int(np.ceil(x[i]))
+            y0, y1 = int(np.floor(y[i])), int(np.ceil(y[i]))
+            dx = x[i] - x0
+            dy = y[i] - y0
+            intensity[i] = (
+                (1 - dx) * (1 - dy) * ar[x0, y0]
+                + (1 - dx) * dy * ar[x0, y1]
+                + dx * (1 - dy) * ar[x1, y0]
+                + dx * dy * ar[x1, y1]
+            )
+
+else:
+
+    def _get_parabolic_subpixel_maxima(ar, x, y, intensity):
+        """
+        Refines the pixel maxima (x,y) of ar in-place by fitting parabolas along x
+        and y through each maximum and its neighbors, and sets intensity to the
+        linearly interpolated value of ar at the refined positions.
+        """
+        ix, iy = x.astype(int), y.astype(int)
+        Ix1_ = ar[ix - 1, iy].astype(np.float64)
+        Ix0 = ar[ix, iy].astype(np.float64)
+        Ix1 = ar[ix + 1, iy].astype(np.float64)
+        Iy1_ = ar[ix, iy - 1].astype(np.float64)
+        Iy1 = ar[ix, iy + 1].astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            deltax = (Ix1 - Ix1_) / (4 * Ix0 - 2 * Ix1 - 2 * Ix1_)
+            deltay = (Iy1 - Iy1_) / (4 * Ix0 - 2 * Iy1 - 2 * Iy1_)
+        # flat maxima are left at the pixel position
+        x += np.where(np.isfinite(deltax), deltax, 0)
+        y += np.where(np.isfinite(deltay), deltay, 0)
+
+        x0, x1 = np.floor(x).astype(int), np.ceil(x).astype(int)
+        y0, y1 = np.floor(y).astype(int), np.ceil(y).astype(int)
+        dx = x - x0
+        dy = y - y0
+        intensity[:] = (
+            (1 - dx) * (1 - dy) * ar[x0, y0]
+            + (1 - dx) * dy * ar[x0, y1]
+            + dx * (1 - dy) * ar[x1, y0]
+            + dx * dy * ar[x1, y1]
+        )
+
+
 def filter_2D_maxima(
     maxima,
     minAbsoluteIntensity=0,
@@ -275,39 +443,48 @@ def filter_2D_maxima(
         a numpy structured array with fields 'x', 'y', 'intensity'
     """
 
+    # Each filter below removes maxima from those kept by the previous ones; the
+    # maxima are only copied once, at the end
+    keep = np.ones(len(maxima), dtype=bool)
+    intensity = maxima["intensity"]
+
     # Remove maxima which are too dim
     if minAbsoluteIntensity > 0:
-        deletemask = maxima["intensity"] < minAbsoluteIntensity
-        maxima = maxima[~deletemask]
+        keep &= intensity >= minAbsoluteIntensity
 
     # Remove maxima which are too dim, compared to the n-th brightest
-    if (minRelativeIntensity > 0) & (len(maxima) > relativeToPeak):
+    inds = np.nonzero(keep)[0]
+    if (minRelativeIntensity > 0) & (len(inds) > relativeToPeak):
         assert isinstance(relativeToPeak, (int, np.integer))
-        deletemask = (
-            maxima["intensity"] / maxima["intensity"][relativeToPeak]
-            < minRelativeIntensity
-        )
-        maxima = maxima[~deletemask]
+        keep &= ~(intensity / intensity[inds[relativeToPeak]] < minRelativeIntensity)
 
     # Remove maxima which are too close
     if minSpacing > 0:
-        deletemask = np.zeros(len(maxima), dtype=bool)
-        for i in range(len(maxima)):
-            if deletemask[i] == False:  # noqa: E712
-                tooClose = (
-                    (maxima["x"] - maxima["x"][i]) ** 2
-                    + (maxima["y"] - maxima["y"][i]) ** 2
-                ) < minSpacing**2
-                tooClose[: i + 1] = False
-                deletemask[tooClose] = True
-        maxima = maxima[~deletemask]
+        inds = np.nonzero(keep)[0]
+        x, y = maxima["x"][inds], maxima["y"][inds]
+        deletemask = np.zeros(len(inds), dtype=bool)
+        # find pairs of maxima (i,j), i<j, closer than minSpacing
+        tree = cKDTree(np.column_stack((x, y)))
+        pairs = tree.query_pairs(minSpacing, output_type="ndarray")
+        tooClose = (x[pairs[:, 0]] - x[pairs[:, 1]]) ** 2 + (
+            y[pairs[:, 0]] - y[pairs[:, 1]]
+        ) ** 2 < minSpacing**2
+        pairs = pairs[tooClose]
+        # maxima are sorted by intensity; keep the brighter maximum of each pair
+        pairs = pairs[np.argsort(pairs[:, 0], kind="stable")]
+        i_inds, starts = np.unique(pairs[:, 0], return_index=True)
+        ends = np.append(starts[1:], len(pairs))
+        for i, start, end in zip(i_inds.tolist(), starts.tolist(), ends.tolist()):
+            if not deletemask[i]:
+                deletemask[pairs[start:end, 1]] = True
+        keep[inds[deletemask]] = False
 
     # Remove maxima in excess of maxNumPeaks
     if maxNumPeaks is not None:
-        if len(maxima) > maxNumPeaks:
-            maxima = maxima[:maxNumPeaks]
+        inds = np.nonzero(keep)[0]
+        keep[inds[maxNumPeaks:]] = False
 
-    return maxima
+    return maxima[keep]
 
 
 def linear_interpolation_2D(ar, x, y):
@@ -559,10 +559,10 @@ class MagneticPtychographicTomography(
             idx_start = self._cum_probes_per_measurement[index]
             idx_end = self._cum_probes_per_measurement[index + 1]
 
+            # positions_px is a view, centered in-place
             positions_px = self._positions_px_all[idx_start:idx_end]
             positions_px_com = positions_px.mean(0)
             positions_px -= positions_px_com - xp_storage.array(self._object_shape) / 2
-            self._positions_px_all[idx_start:idx_end] = positions_px.copy()
 
         self._positions_px_initial_all = self._positions_px_all.copy()
         self._positions_initial_all = self._positions_px_initial_all.copy()
@@ -1079,6 +1079,8 @@ class MagneticPtychographicTomography(
         if q_lowpass_m is None:
             q_lowpass_m = q_lowpass_e
 
+        object_sliced_old = None
+
         # main loop
         for a0 in tqdmnd(
             num_iter,
@@ -1128,7 +1130,13 @@ class MagneticPtychographicTomography(
                 ]
 
                 if not use_projection_scheme:
-                    object_sliced_old = object_sliced.copy()
+                    # reuse buffer across tilts and iterations
+                    if (
+                        object_sliced_old is None
+                        or object_sliced_old.dtype != object_sliced.dtype
+                    ):
+                        object_sliced_old = xp.empty_like(object_sliced)
+                    object_sliced_old[:] = object_sliced
 
                 start_idx = self._cum_probes_per_measurement[
                     self._active_measurement_index
@@ -1370,7 +1378,7 @@ class MagneticPtychographicTomography(
             self.error_iterations.append(error.item())
 
             if store_iterations:
-                self.object_iterations.append(asnumpy(self._object.copy()))
+                self._store_object_iteration()
                 self.probe_iterations.append(self.probe_centered)
 
         # store result
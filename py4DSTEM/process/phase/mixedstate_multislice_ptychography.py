@@ -1129,7 +1129,7 @@ class MixedstateMultislicePtychography(
             self.error_iterations.append(error.item())
 
             if store_iterations:
-                self.object_iterations.append(asnumpy(self._object.copy()))
+                self._store_object_iteration()
                 self.probe_iterations.append(self.probe_centered)
 
         # store result
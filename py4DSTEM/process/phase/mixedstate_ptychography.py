@@ -1010,7 +1010,7 @@ class MixedstatePtychography(
             self.error_iterations.append(error.item())
 
             if store_iterations:
-                self.object_iterations.append(asnumpy(self._object.copy()))
+                self._store_object_iteration()
                 self.probe_iterations.append(self.probe_centered)
 
         # store result
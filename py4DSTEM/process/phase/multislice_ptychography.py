@@ -1098,7 +1098,7 @@ class MultislicePtychography(
             self.error_iterations.append(error.item())
 
             if store_iterations:
-                self.object_iterations.append(asnumpy(self._object.copy()))
+                self._store_object_iteration()
                 self.probe_iterations.append(self.probe_centered)
 
         # store result
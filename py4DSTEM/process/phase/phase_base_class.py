@@ -2194,6 +2194,15 @@ class PtychographicReconstruction(PhaseReconstruction):
 
         return current_object, current_probe, current_positions
 
+    def _store_object_iteration(self):
+        """Appends a host copy of the current object to self.object_iterations"""
+
+        # asnumpy already returns a new host array on the GPU
+        if self._device == "gpu":
+            self.object_iterations.append(self._asnumpy(self._object))
+        else:
+            self.object_iterations.append(self._object.copy())
+
     @property
     def angular_sampling(self):
         """Angular sampling [mrad]"""
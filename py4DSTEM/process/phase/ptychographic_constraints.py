@@ -823,6 +823,10 @@ class Object3DConstraintsMixin:
         if q_lowpass:
             env *= 1 / (1 + (qra / q_lowpass) ** (2 * butterworth_order))
 
+        # keep single precision objects in single precision
+        dtype = current_object.dtype
+        env = env.astype(xp.finfo(dtype).dtype, copy=False)
+
         current_object_mean = xp.mean(current_object)
         current_object -= current_object_mean
         current_object = xp.fft.ifftn(xp.fft.fftn(current_object) * env)
@@ -831,7 +835,7 @@ class Object3DConstraintsMixin:
         if self._object_type == "potential":
             current_object = xp.real(current_object)
 
-        return current_object
+        return current_object.astype(dtype, copy=False)
 
     def _object_constraints(
         self,
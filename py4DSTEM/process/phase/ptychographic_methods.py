@@ -843,30 +843,172 @@ class Object3DMethodsMixin:
         normalized_array = array / xp.asarray(voxels_in_slice)[:, None, None]
         return xp.repeat(normalized_array, voxels_per_slice, axis=0)[:output_z]
 
+    def _add_expanded_sliced_object(self, array: np.ndarray, sliced_array: np.ndarray):
+        """
+        Adds the expansion of a supersliced object to array in-place,
+        without allocating the expanded array.
+
+        Parameters
+        ----------
+        array: np.ndarray
+            3D array to add to
+        sliced_array: np.ndarray
+            3D supersliced array to expand
+
+        Returns
+        -------
+        array: np.ndarray
+            updated array
+        """
+        xp = self._xp
+        output_z = array.shape[0]
+        input_z = sliced_array.shape[0]
+
+        voxels_per_slice = np.ceil(output_z / input_z).astype("int")
+        remainder_size = voxels_per_slice - (voxels_per_slice * input_z - output_z)
+
+        voxels_in_slice = xp.repeat(voxels_per_slice, input_z)
+        voxels_in_slice[-1] = remainder_size if remainder_size > 0 else voxels_per_slice
+
+        normalized_array = sliced_array / xp.asarray(voxels_in_slice)[:, None, None]
+
+        # slices spanning voxels_per_slice voxels, added one strided view at a time
+        num_full_slices = min(input_z, output_z // voxels_per_slice)
+        end = num_full_slices * voxels_per_slice
+        for offset in range(voxels_per_slice):
+            array[offset:end:voxels_per_slice] += normalized_array[:num_full_slices]
+
+        # partially-filled last slice
+        if num_full_slices < input_z and end < output_z:
+            array[end:] += normalized_array[num_full_slices]
+
+        return array
+
     def _rotate_zxy_volume(
         self,
         volume_array,
         rot_matrix,
         order=3,
+        method="spline",
     ):
-        """ """
+        """
+        Rotates a zxy volume about its center.
+
+        Parameters
+        ----------
+        volume_array: np.ndarray
+            3D array to rotate
+        rot_matrix: np.ndarray
+            3x3 rotation matrix
+        order: int, optional
+            Spline interpolation order, used when method is 'spline'
+        method: str, optional
+            One of 'spline', which uses an affine transform with spline
+            interpolation, or 'fourier-shear', which decomposes rotations about a
+            single axis into three 1D Fourier shears. Rotations about multiple
+            axes, or by more than 90 degrees, always use 'spline'.
+
+        Returns
+        -------
+        rotated_volume: np.ndarray
+            rotated array
+        """
 
         xp = self._xp
         affine_transform = self._scipy.ndimage.affine_transform
         swap_zxy_to_xyz = self._swap_zxy_to_xyz
 
-        volume = volume_array.copy()
-        volume_shape = xp.asarray(volume.shape)
-        tf = xp.asarray(swap_zxy_to_xyz.T @ rot_matrix.T @ swap_zxy_to_xyz)
+        tf = swap_zxy_to_xyz.T @ rot_matrix.T @ swap_zxy_to_xyz
+
+        if method == "fourier-shear":
+            # find a single rotation axis, if there is one
+            for axis in range(3):
+                plane_axes = [ax for ax in range(3) if ax != axis]
+                fixed = np.zeros((3, 3))
+                fixed[axis, axis] = 1
+                fixed[np.ix_(plane_axes, plane_axes)] = tf[
+                    np.ix_(plane_axes, plane_axes)
+                ]
+                if np.allclose(tf, fixed):
+                    angle = np.arctan2(
+                        tf[plane_axes[1], plane_axes[0]],
+                        tf[plane_axes[0], plane_axes[0]],
+                    )
+                    if np.abs(angle) <= np.pi / 2:
+                        return self._rotate_volume_three_shear(
+                            volume_array, angle, plane_axes
+                        )
+                    break
+        elif method != "spline":
+            raise ValueError(
+                f"method must be either 'spline' or 'fourier-shear', not {method}"
+            )
+
+        volume_shape = xp.asarray(volume_array.shape)
+        tf = xp.asarray(tf)
 
         in_center = (volume_shape - 1) / 2
         out_center = tf @ in_center
         offset = in_center - out_center
 
-        volume = affine_transform(volume, tf, offset=offset, order=order)
+        volume = affine_transform(volume_array, tf, offset=offset, order=order)
 
         return volume
 
+    def _rotate_volume_three_shear(self, volume_array, angle, axes):
+        """
+        Rotates a volume about its center in the plane of axes, by decomposing the
+        rotation into three shears which are applied as 1D Fourier shifts.
+
+        Parameters
+        ----------
+        volume_array: np.ndarray
+            3D array to rotate
+        angle: float
+            Rotation angle in radians, at most pi/2 in magnitude
+        axes: (int,int)
+            Axes spanning the rotation plane
+
+        Returns
+        -------
+        rotated_volume: np.ndarray
+            rotated array
+        """
+        xp = self._xp
+        axis_a, axis_b = axes
+
+        alpha = -np.tan(angle / 2)
+        beta = np.sin(angle)
+
+        volume = volume_array
+        for shear_axis, position_axis, shear in (
+            (axis_a, axis_b, alpha),
+            (axis_b, axis_a, beta),
+            (axis_a, axis_b, alpha),
+        ):
+            n = volume.shape[shear_axis]
+            m = volume.shape[position_axis]
+
+            # shift each line along shear_axis by -shear * (centered position)
+            q = xp.fft.fftfreq(n)
+            positions = xp.arange(m) - (m - 1) / 2
+            ramp_shape = [1, 1, 1]
+            ramp_shape[shear_axis] = n
+            q = q.reshape(ramp_shape)
+            ramp_shape[shear_axis] = 1
+            ramp_shape[position_axis] = m
+            positions = positions.reshape(ramp_shape)
+            ramp = xp.exp(2j * np.pi * shear * q * positions)
+
+            volume = xp.fft.ifft(
+                xp.fft.fft(volume, axis=shear_axis) * ramp, axis=shear_axis
+            )
+
+        if xp.isrealobj(volume_array):
+            volume = volume.real
+
+        return volume.astype(volume_array.dtype, copy=False)
+
     def _initialize_object(
         self,
         initial_object,
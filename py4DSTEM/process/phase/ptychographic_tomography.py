@@ -3,6 +3,7 @@ Module for reconstructing phase objects from 4DSTEM datasets using iterative met
 namely joint ptychographic tomography.
 """
 
+import os
 import warnings
 from typing import Mapping, Sequence, Tuple
 
@@ -203,10 +204,18 @@ class PtychographicTomography(
         self._rolloff = rolloff
         self._object_type = object_type
         self._object_padding_px = object_padding_px
+        self._object_fov_ang = None
         self._positions_mask = positions_mask
         self._verbose = verbose
         self._preprocessed = False
 
+        # pending asynchronous copies of stored object iterations
+        self._object_iteration_pending = []
+        self._object_iteration_buffers = None
+
+        # memory-mapped files of stored object iterations written by this object
+        self._object_iterations_paths = []
+
         # Class-specific Metadata
         self._num_slices = num_slices
         self._tilt_orientation_matrices = tuple(tilt_orientation_matrices)
@@ -489,6 +498,7 @@ class PtychographicTomography(
                 com_fitted_y,
                 self._positions_mask[index],
                 crop_patterns,
+                in_place_datacube_modification,
             )
 
             self._mean_diffraction_intensity.append(mean_diffraction_intensity_temp)
@@ -552,10 +562,10 @@ class PtychographicTomography(
             idx_start = self._cum_probes_per_measurement[index]
             idx_end = self._cum_probes_per_measurement[index + 1]
 
+            # positions_px is a view, centered in-place
             positions_px = self._positions_px_all[idx_start:idx_end]
             positions_px_com = positions_px.mean(0)
             positions_px -= positions_px_com - xp_storage.array(self._object_shape) / 2
-            self._positions_px_all[idx_start:idx_end] = positions_px.copy()
 
         self._positions_px_initial_all = self._positions_px_all.copy()
         self._positions_initial_all = self._positions_px_initial_all.copy()
@@ -792,7 +802,10 @@ class PtychographicTomography(
         tv_denoise_weights: float = None,
         tv_denoise_inner_iter=40,
         collective_measurement_updates: bool = True,
+        shuffle_tilts: bool = True,
+        rotation_method: str = "spline",
         store_iterations: bool = False,
+        store_iterations_path: str = None,
         progress_bar: bool = True,
         reset: bool = None,
         device: str = None,
@@ -894,6 +907,14 @@ class PtychographicTomography(
             Number of iterations to run in inner loop of TV denoising
         collective_measurement_updates: bool
             if True perform collective measurement updates (i.e. one per tilt)
+        shuffle_tilts: bool, optional
+            If True, tilts are updated in a random order at each iteration.
+            If False, tilts are updated in an order which minimizes the rotation
+            between consecutive tilts
+        rotation_method: str, optional
+            Method used to rotate the object between tilts. One of 'spline' or
+            'fourier-shear'. 'fourier-shear' is faster and uses three 1D Fourier
+            shears for single-axis rotations, falling back to 'spline' otherwise
         shrinkage_rad: float
             Phase shift in radians to be subtracted from the potential at each iteration
         fix_potential_baseline: bool
@@ -903,6 +924,13 @@ class PtychographicTomography(
             Useful when detector has artifacts such as dead-pixels. Usually binary.
         store_iterations: bool, optional
             If True, reconstructed objects and probes are stored at each iteration
+        store_iterations_path: str, optional
+            If not None, stored objects are written to a .npy memory-mapped file at
+            this path instead of being held in memory. The file lists only the
+            iterations written so far, so an interrupted run leaves no unwritten
+            entries. Files holding iterations from previous calls to reconstruct
+            are left in place, and the new iterations are written to a file with a
+            numbered suffix instead, e.g. path_1.npy
         progress_bar: bool, optional
             If True, reconstruction progress is displayed
         reset: bool, optional
@@ -979,6 +1007,21 @@ class PtychographicTomography(
         if detector_fourier_mask is not None:
             detector_fourier_mask = xp.asarray(detector_fourier_mask)
 
+        # asynchronous device-to-host copies of stored iterations
+        if store_iterations and device == "gpu":
+            self._iteration_copy_stream = cp.cuda.Stream(non_blocking=True)
+            self._object_iteration_pending = []
+
+        # memory-mapped storage of stored iterations
+        self._object_iterations_memmap = None
+        if store_iterations and store_iterations_path is not None:
+            self._open_object_iterations_memmap(store_iterations_path, num_iter)
+
+        if not shuffle_tilts:
+            tilt_order = self._return_tilt_order()
+
+        object_sliced_old = None
+
         # main loop
         for a0 in tqdmnd(
             num_iter,
@@ -991,8 +1034,11 @@ class PtychographicTomography(
             if collective_measurement_updates:
                 collective_object = xp.zeros_like(self._object)
 
-            indices = np.arange(self._num_measurements)
-            np.random.shuffle(indices)
+            if shuffle_tilts:
+                indices = np.arange(self._num_measurements)
+                np.random.shuffle(indices)
+            else:
+                indices = tilt_order
 
             old_rot_matrix = np.eye(3)  # identity
 
@@ -1007,6 +1053,7 @@ class PtychographicTomography(
                 self._object = self._rotate_zxy_volume(
                     self._object,
                     rot_matrix @ old_rot_matrix.T,
+                    method=rotation_method,
                 )
 
                 object_sliced = self._project_sliced_object(
@@ -1019,7 +1066,13 @@ class PtychographicTomography(
                 ]
 
                 if not use_projection_scheme:
-                    object_sliced_old = object_sliced.copy()
+                    # reuse buffer across tilts and iterations
+                    if (
+                        object_sliced_old is None
+                        or object_sliced_old.dtype != object_sliced.dtype
+                    ):
+                        object_sliced_old = xp.empty_like(object_sliced)
+                    object_sliced_old[:] = object_sliced
 
                 start_idx = self._cum_probes_per_measurement[
                     self._active_measurement_index
@@ -1114,16 +1167,17 @@ class PtychographicTomography(
                 if not use_projection_scheme:
                     object_sliced -= object_sliced_old
 
-                object_update = self._expand_sliced_object(
-                    object_sliced, self._num_voxels
-                )
-
                 if collective_measurement_updates:
+                    object_update = self._expand_sliced_object(
+                        object_sliced, self._num_voxels
+                    )
                     collective_object += self._rotate_zxy_volume(
-                        object_update, rot_matrix.T
+                        object_update, rot_matrix.T, method=rotation_method
                     )
                 else:
-                    self._object += object_update
+                    self._object = self._add_expanded_sliced_object(
+                        self._object, object_sliced
+                    )
 
                 old_rot_matrix = rot_matrix
 
@@ -1196,11 +1250,10 @@ class PtychographicTomography(
                         fix_positions=fix_positions,
                         fix_positions_com=fix_positions_com and not fix_positions,
                         global_affine_transformation=global_affine_transformation,
-                        gaussian_filter=gaussian_filter
-                        and gaussian_filter_sigma is not None,
+                        # smoothness filters are applied once, after all tilts
+                        gaussian_filter=False,
                         gaussian_filter_sigma=gaussian_filter_sigma,
-                        butterworth_filter=butterworth_filter
-                        and (q_lowpass is not None or q_highpass is not None),
+                        butterworth_filter=False,
                         q_lowpass=q_lowpass,
                         q_highpass=q_highpass,
                         butterworth_order=butterworth_order,
@@ -1217,7 +1270,9 @@ class PtychographicTomography(
                         tv_denoise_inner_iter=tv_denoise_inner_iter,
                     )
 
-            self._object = self._rotate_zxy_volume(self._object, old_rot_matrix.T)
+            self._object = self._rotate_zxy_volume(
+                self._object, old_rot_matrix.T, method=rotation_method
+            )
 
             # Normalize Error Over Tilts
             error /= self._num_measurements
@@ -1249,12 +1304,40 @@ class PtychographicTomography(
                     tv_denoise_inner_iter=tv_denoise_inner_iter,
                 )
 
+            else:
+                # object smoothness filters only
+                self._object = self._object_constraints(
+                    self._object,
+                    gaussian_filter=gaussian_filter
+                    and gaussian_filter_sigma is not None,
+                    gaussian_filter_sigma=gaussian_filter_sigma,
+                    butterworth_filter=butterworth_filter
+                    and (q_lowpass is not None or q_highpass is not None),
+                    q_lowpass=q_lowpass,
+                    q_highpass=q_highpass,
+                    butterworth_order=butterworth_order,
+                    object_positivity=False,
+                    shrinkage_rad=0.0,
+                    object_mask=None,
+                    tv_denoise=False,
+                    tv_denoise_weights=None,
+                    tv_denoise_inner_iter=tv_denoise_inner_iter,
+                )
+
             self.error_iterations.append(error.item())
 
             if store_iterations:
-                self.object_iterations.append(asnumpy(self._object.copy()))
+                self._store_object_iteration()
                 self.probe_iterations.append(self.probe_centered)
 
+        if store_iterations:
+            self._synchronize_object_iterations()
+            self._object_iteration_buffers = None
+
+        if self._object_iterations_memmap is not None:
+            self._object_iterations_memmap.flush()
+            self._object_iterations_memmap = None
+
         # store result
         self.object = asnumpy(self._object)
         self.probe = self.probe_centered
@@ -1267,3 +1350,148 @@ class PtychographicTomography(
         self.clear_device_mem(self._device, self._clear_fft_cache)
 
         return self
+
+    def _return_tilt_order(self):
+        """
+        Returns an ordering of the tilts which starts at one end of the tilt series
+        and greedily steps to the nearest remaining tilt, such that the object is
+        rotated by small angles between consecutive tilts.
+        """
+        rot_matrices = np.asarray(self._tilt_orientation_matrices)
+
+        # rotation angle between each pair of orientations
+        traces = np.einsum("aij,bij->ab", rot_matrices, rot_matrices)
+        angles = np.arccos(np.clip((traces - 1) / 2, -1, 1))
+
+        tilt_order = [np.argmax(angles.max(axis=1))]
+        remaining = np.ones(self._num_measurements, dtype=bool)
+        remaining[tilt_order[0]] = False
+        for _ in range(self._num_measurements - 1):
+            next_angles = np.where(remaining, angles[tilt_order[-1]], np.inf)
+            tilt_order.append(np.argmin(next_angles))
+            remaining[tilt_order[-1]] = False
+
+        return np.array(tilt_order)
+
+    def _open_object_iterations_memmap(self, store_iterations_path, num_iter):
+        """
+        Opens a .npy memory-mapped file with room for num_iter stored iterations,
+        at store_iterations_path unless this object has already written iterations
+        there. Earlier files, which iterations in self.object_iterations may still
+        be views into, are never truncated, overwritten or replaced.
+        """
+        path = store_iterations_path
+        root, ext = os.path.splitext(store_iterations_path)
+        suffix = 0
+        while path in self._object_iterations_paths:
+            suffix += 1
+            path = f"{root}_{suffix}{ext}"
+        self._object_iterations_paths.append(path)
+
+        self._object_iterations_memmap = np.lib.format.open_memmap(
+            path,
+            mode="w+",
+            dtype=self._object.dtype,
+            shape=(num_iter,) + self._object.shape,
+        )
+        self._object_iterations_memmap_index = 0
+        self._write_object_iterations_header()
+
+    def _write_object_iterations_header(self):
+        """
+        Rewrites the header of the open stored-iterations file so that its shape
+        lists only the iterations written so far. The new header is padded to the
+        length of the old one, so the data offset of the memory map is unchanged.
+        """
+        memmap = self._object_iterations_memmap
+        header = repr(
+            {
+                "descr": np.lib.format.dtype_to_descr(memmap.dtype),
+                "fortran_order": False,
+                "shape": (self._object_iterations_memmap_index,) + memmap.shape[1:],
+            }
+        )
+        with open(memmap.filename, "r+b") as f:
+            version = np.lib.format.read_magic(f)
+            length_bytes = 2 if version == (1, 0) else 4
+            header_length = int.from_bytes(f.read(length_bytes), "little")
+            f.write(header.ljust(header_length - 1).encode("latin1") + b"\n")
+
+    def _store_object_iteration(self, num_buffers=2):
+        """
+        Appends a host copy of the current object to self.object_iterations.
+        If a memory-mapped file is open, the copy is written to its next slot.
+        Otherwise on the GPU, a device snapshot of the object is copied on a
+        separate stream into one of a ring of num_buffers reusable pinned host
+        buffers, overlapping the transfer with the following iterations. Finished
+        copies are moved into ordinary host arrays before their buffer is reused.
+        """
+        if self._object_iterations_memmap is not None:
+            object_iteration = self._object_iterations_memmap[
+                self._object_iterations_memmap_index
+            ]
+
+            if self._device == "gpu":
+                cp.ascontiguousarray(self._object).get(out=object_iteration)
+            else:
+                object_iteration[:] = self._object
+
+            # the header only lists the iteration once its data is written
+            self._object_iterations_memmap_index += 1
+            self._write_object_iterations_header()
+
+            self.object_iterations.append(object_iteration)
+        elif self._device == "gpu":
+            from cupyx import empty_pinned
+
+            pending = self._object_iteration_pending
+            buffers = self._object_iteration_buffers
+            if (
+                buffers is None
+                or len(buffers) != num_buffers
+                or buffers[0].shape != self._object.shape
+                or buffers[0].dtype != self._object.dtype
+            ):
+                self._synchronize_object_iterations()
+                buffers = [
+                    empty_pinned(self._object.shape, dtype=self._object.dtype)
+                    for _ in range(num_buffers)
+                ]
+                self._object_iteration_buffers = buffers
+
+            # free the oldest buffer in the ring
+            if len(pending) == num_buffers:
+                self._retire_object_iteration()
+            buffer = buffers[(len(self.object_iterations) + len(pending)) % num_buffers]
+
+            # snapshot on the current stream, so later in-place updates of the
+            # object are ordered after it and cannot race the transfer
+            source = self._object.copy()
+            copy_stream = self._iteration_copy_stream
+            copy_stream.wait_event(cp.cuda.get_current_stream().record())
+            cp.cuda.runtime.memcpyAsync(
+                buffer.ctypes.data,
+                source.data.ptr,
+                source.nbytes,
+                cp.cuda.runtime.memcpyDeviceToHost,
+                copy_stream.ptr,
+            )
+            pending.append((copy_stream.record(), source, buffer))
+        else:
+            super()._store_object_iteration()
+
+    def _retire_object_iteration(self):
+        """
+        Waits for the oldest pending copy of a stored object iteration, and appends
+        it to self.object_iterations as an ordinary host array.
+        """
+        event, _, buffer = self._object_iteration_pending.pop(0)
+        event.synchronize()
+        self.object_iterations.append(np.array(buffer))
+
+    def _synchronize_object_iterations(self):
+        """
+        Waits for all pending asynchronous copies of stored object iterations.
+        """
+        while self._object_iteration_pending:
+            self._retire_object_iteration()
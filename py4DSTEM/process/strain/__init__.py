@@ -2,6 +2,7 @@ from py4DSTEM.process.strain.strain import StrainMap
 from py4DSTEM.process.strain.latticevectors import (
     index_bragg_directions,
     add_indices_to_braggvectors,
+    index_peaks_to_lattice,
     fit_lattice_vectors,
     fit_lattice_vectors_all_DPs,
     get_reference_g1g2,
@@ -5,6 +5,11 @@ from emdfile import PointList, PointListArray, tqdmnd
 from numpy.linalg import lstsq
 from py4DSTEM.data import RealSlice
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 
 def index_bragg_directions(x0, y0, gx, gy, g1, g2):
     """
@@ -61,6 +66,60 @@ def index_bragg_directions(x0, y0, gx, gy, g1, g2):
     return g1_ind, g2_ind, bragg_directions
 
 
+def index_peaks_to_lattice(qx, qy, lattice_qx, lattice_qy, max_peak_spacing):
+    """
+    For each peak (qx[i],qy[i]), find the index of the nearest lattice point
+    (lattice_qx,lattice_qy). Peaks farther than max_peak_spacing from every
+    lattice point are assigned an index of -1.
+
+    Args:
+        qx,qy (1d arrays): peak positions, concatenated over any number of
+            diffraction patterns
+        lattice_qx,lattice_qy (1d arrays): lattice point positions
+        max_peak_spacing (float): maximum distance from the lattice points
+            to index a peak
+
+    Returns:
+        (1d array of ints): the index of the nearest lattice point for each peak
+    """
+    qx, qy, lattice_qx, lattice_qy = (
+        np.asarray(x, dtype=np.float64) for x in (qx, qy, lattice_qx, lattice_qy)
+    )
+    if njit is not None:
+        return _index_peaks_to_lattice(
+            qx, qy, lattice_qx, lattice_qy, float(max_peak_spacing)
+        )
+
+    # compare squared distances to avoid computing square roots
+    dx = qx[:, np.newaxis] - lattice_qx[np.newaxis, :]
+    dy = qy[:, np.newaxis] - lattice_qy[np.newaxis, :]
+    r2 = dx * dx + dy * dy
+    inds = np.argmin(r2, axis=1)
+    inds[r2[np.arange(inds.shape[0]), inds] > max_peak_spacing**2] = -1
+    return inds
+
+
+if njit is not None:
+
+    @njit(parallel=True, cache=True)
+    def _index_peaks_to_lattice(qx, qy, lattice_qx, lattice_qy, max_peak_spacing):
+        # compare squared distances to avoid computing square roots
+        max_r2 = max_peak_spacing * max_peak_spacing
+        inds = np.empty(qx.shape[0], dtype=np.int64)
+        for i in prange(qx.shape[0]):
+            ind = -1
+            r2_min = np.inf
+            for j in range(lattice_qx.shape[0]):
+                dx = qx[i] - lattice_qx[j]
+                dy = qy[i] - lattice_qy[j]
+                r2 = dx * dx + dy * dy
+                if r2 < r2_min:
+                    r2_min = r2
+                    ind = j
+            inds[i] = ind if r2_min <= max_r2 else -1
+        return inds
+
+
 def add_indices_to_braggvectors(
     braggpeaks, lattice, maxPeakSpacing, qx_shift=0, qy_shift=0, mask=None
 ):
@@ -118,32 +177,51 @@ def add_indices_to_braggvectors(
 
     calstate = braggpeaks.calstate
 
-    # loop over all the scan positions
+    lattice_qx = np.ascontiguousarray(lattice.data["qx"], dtype=np.float64)
+    lattice_qy = np.ascontiguousarray(lattice.data["qy"], dtype=np.float64)
+    lattice_g1_ind = np.ascontiguousarray(lattice.data["g1_ind"])
+    lattice_g2_ind = np.ascontiguousarray(lattice.data["g2_ind"])
+
+    # collect the peaks at all the masked scan positions
+    positions = []
+    pointlists = []
     for Rx, Ry in tqdmnd(mask.shape[0], mask.shape[1]):
         if mask[Rx, Ry]:
-            pl = braggpeaks.get_vectors(
-                Rx,
-                Ry,
-                center=True,
-                ellipse=calstate["ellipse"],
-                rotate=calstate["rotate"],
-                pixel=False,
+            positions.append((Rx, Ry))
+            pointlists.append(
+                braggpeaks.get_vectors(
+                    Rx,
+                    Ry,
+                    center=True,
+                    ellipse=calstate["ellipse"],
+                    rotate=calstate["rotate"],
+                    pixel=False,
+                ).data
+            )
+    if len(pointlists) == 0:
+        return indexed_braggpeaks
+
+    # index every peak in one call, then split the indices by scan position
+    peaks = np.concatenate(pointlists)
+    ind = index_peaks_to_lattice(
+        np.ascontiguousarray(peaks["qx"] + qx_shift, dtype=np.float64),
+        np.ascontiguousarray(peaks["qy"] + qy_shift, dtype=np.float64),
+        lattice_qx,
+        lattice_qy,
+        maxPeakSpacing,
+    )
+    splits = np.cumsum([len(data) for data in pointlists])[:-1]
+    for (Rx, Ry), data, ind in zip(positions, pointlists, np.split(ind, splits)):
+        keep = ind >= 0
+        indexed_braggpeaks[Rx, Ry].add_data_by_field(
+            (
+                data["qx"][keep],
+                data["qy"][keep],
+                data["intensity"][keep],
+                lattice_g1_ind[ind[keep]],
+                lattice_g2_ind[ind[keep]],
             )
-            for i in range(pl.data.shape[0]):
-                r2 = (pl.data["qx"][i] - lattice.data["qx"] + qx_shift) ** 2 + (
-                    pl.data["qy"][i] - lattice.data["qy"] + qy_shift
-                ) ** 2
-                ind = np.argmin(r2)
-                if r2[ind] <= maxPeakSpacing**2:
-                    indexed_braggpeaks[Rx, Ry].add_data_by_field(
-                        (
-                            pl.data["qx"][i],
-                            pl.data["qy"][i],
-                            pl.data["intensity"][i],
-                            lattice.data["g1_ind"][ind],
-                            lattice.data["g2_ind"][ind],
-                        )
-                    )
+        )
 
     return indexed_braggpeaks
 
@@ -17,6 +17,7 @@ from py4DSTEM.process.strain.latticevectors import (
     get_rotated_strain_map,
     get_strain_from_reference_g1g2,
     index_bragg_directions,
+    index_peaks_to_lattice,
 )
 from py4DSTEM.visualize import (
     show,
@@ -260,26 +261,42 @@ class StrainMap(RealSlice, Data):
 
         # guess the origin and g1 g2 vectors if indices aren't provided
         if np.any([x is None for x in (index_g1, index_g2, index_origin)]):
+            if len(g) < 3:
+                raise ValueError(
+                    "At least three maxima are needed to guess the lattice "
+                    f"vectors, but {len(g)} were found; adjust the maxima "
+                    "detection parameters or pass index_g1, index_g2 and "
+                    "index_origin"
+                )
+
             # get distances and angles from calibrated origin
             g_dists = np.hypot(g["x"] - self.origin[0], g["y"] - self.origin[1])
             g_angles = np.angle(
                 g["x"] - self.origin[0] + 1j * (g["y"] - self.origin[1])
             )
 
+            # find the three maxima nearest the origin, sorted by distance
+            nearest = np.argpartition(g_dists, min(2, len(g_dists) - 1))[:3]
+            nearest = [
+                i
+                for i in nearest[np.argsort(g_dists[nearest], kind="stable")]
+                if i not in (index_origin, index_g1)
+            ]
+
             # guess the origin
             if index_origin is None:
-                index_origin = np.argmin(g_dists)
-                g_dists[index_origin] = 2 * np.max(g_dists)
+                index_origin = nearest.pop(0)
 
             # guess g1
             if index_g1 is None:
-                index_g1 = np.argmin(g_dists)
-                g_dists[index_g1] = 2 * np.max(g_dists)
+                index_g1 = nearest.pop(0)
 
             # guess g2
             if index_g2 is None:
                 angle_scaling = np.cos(g_angles - g_angles[index_g1]) ** 2
-                index_g2 = np.argmin(g_dists * (angle_scaling + 0.1))
+                g2_dists = g_dists * (angle_scaling + 0.1)
+                g2_dists[[index_origin, index_g1]] = np.inf
+                index_g2 = np.argmin(g2_dists)
 
         # get the lattice vectors
         gx, gy = g["x"], g["y"]
@@ -579,9 +596,16 @@ class StrainMap(RealSlice, Data):
             shape=self.braggvectors.Rshape,
         )
 
-        # loop over all the scan positions
-        # and perform indexing, excluding peaks outside of max_peak_spacing
+        # cache the bragg directions as contiguous arrays
+        bd_qx = np.ascontiguousarray(self.braggdirections.data["qx"], dtype=np.float64)
+        bd_qy = np.ascontiguousarray(self.braggdirections.data["qy"], dtype=np.float64)
+        bd_g1_ind = np.ascontiguousarray(self.braggdirections.data["g1_ind"])
+        bd_g2_ind = np.ascontiguousarray(self.braggdirections.data["g2_ind"])
+
+        # gather the vectors from all the scan positions
         calstate = self.braggvectors.calstate
+        positions = []
+        vectors = []
         for Rx, Ry in tqdmnd(
             mask.shape[0],
             mask.shape[1],
@@ -598,22 +622,35 @@ class StrainMap(RealSlice, Data):
                     rotate=calstate["rotate"],
                     pixel=False,
                 )
-                for i in range(pl.data.shape[0]):
-                    r = np.hypot(
-                        pl.data["qx"][i] - self.braggdirections.data["qx"],
-                        pl.data["qy"][i] - self.braggdirections.data["qy"],
-                    )
-                    ind = np.argmin(r)
-                    if r[ind] <= self.max_peak_spacing:
-                        indexed_braggpeaks[Rx, Ry].add_data_by_field(
-                            (
-                                pl.data["qx"][i],
-                                pl.data["qy"][i],
-                                pl.data["intensity"][i],
-                                self.braggdirections.data["g1_ind"][ind],
-                                self.braggdirections.data["g2_ind"][ind],
-                            )
-                        )
+                positions.append((Rx, Ry))
+                vectors.append(pl.data)
+        offsets = np.cumsum([0] + [v.shape[0] for v in vectors])
+
+        # index all the peaks at once, excluding peaks outside of max_peak_spacing
+        if len(vectors) > 0:
+            vectors = np.concatenate(vectors)
+            inds = index_peaks_to_lattice(
+                np.ascontiguousarray(vectors["qx"], dtype=np.float64),
+                np.ascontiguousarray(vectors["qy"], dtype=np.float64),
+                bd_qx,
+                bd_qy,
+                self.max_peak_spacing,
+            )
+
+        # populate the indexed braggpeaks
+        for (Rx, Ry), i0, i1 in zip(positions, offsets[:-1], offsets[1:]):
+            ind = inds[i0:i1]
+            keep = ind >= 0
+            v = vectors[i0:i1][keep]
+            indexed_braggpeaks[Rx, Ry].add_data_by_field(
+                (
+                    v["qx"],
+                    v["qy"],
+                    v["intensity"],
+                    bd_g1_ind[ind[keep]],
+                    bd_g2_ind[ind[keep]],
+                )
+            )
         self.bragg_vectors_indexed = indexed_braggpeaks
 
         # fit bragg vectors
@@ -1,6 +1,7 @@
 # Cross correlation function
 
 import numpy as np
+from scipy.fft import fft2, ifft2
 from py4DSTEM.preprocess.utils import get_shifted_ar
 from py4DSTEM.process.utils.multicorr import upsampled_correlation
 
@@ -19,32 +20,55 @@ def get_cross_correlation(ar, template, corrPower=1, _returnval="real"):
     Otherwise, returns the complex valued result.
     """
     assert _returnval in ("real", "fourier")
-    template_FT = np.conj(np.fft.fft2(template))
+    template_FT = np.conj(fft2(template))
     return get_cross_correlation_FT(
         ar, template_FT, corrPower=corrPower, _returnval=_returnval
     )
 
 
-def get_cross_correlation_FT(ar, template_FT, corrPower=1, _returnval="real"):
+def get_cross_correlation_FT(
+    ar, template_FT, corrPower=1, _returnval="real", workers=None
+):
     """
     Get the cross/phase/hybrid correlation of `ar` with `template_FT`, where
     the latter is already in Fourier space (i.e. `template_FT` is
     `np.conj(np.fft.fft2(template))`.
 
+    If `ar` is a 3D stack of arrays, the correlations of each ar[i,:,:] are
+    computed with a single batched FFT. `workers` sets the number of threads
+    used by the FFTs (see scipy.fft), with -1 using all CPUs.
+
     If _returnval is 'real', returns the real-valued cross-correlation.
     Otherwise, returns the complex valued result.
     """
     assert _returnval in ("real", "fourier")
-    m = np.fft.fft2(ar) * template_FT
-    if corrPower != 1:
-        cc = np.abs(m) ** (corrPower) * np.exp(1j * np.angle(m))
-    else:
-        cc = m
+    m = fft2(ar, workers=workers) * template_FT
+    cc = _apply_correlation_power(m, corrPower)
     if _returnval == "real":
-        cc = np.maximum(np.real(np.fft.ifft2(cc)), 0)
+        cc = np.maximum(np.real(ifft2(cc, workers=workers)), 0)
     return cc
 
 
+def _apply_correlation_power(m, corrPower):
+    """
+    Returns the hybrid correlation |m|**corrPower * exp(1j*angle(m)) of the
+    complex array `m`, computed in-place as m * |m|**(corrPower-1) to avoid
+    evaluating any trigonometric functions. Elements where m is zero are left
+    as zero.
+    """
+    if corrPower == 1:
+        return m
+
+    xp = np if isinstance(m, np.ndarray) else cp
+    m_abs = xp.abs(m)
+    if xp is np:
+        np.power(m_abs, corrPower - 1, out=m_abs, where=m_abs > 0)
+    else:
+        m_abs = xp.where(m_abs > 0, m_abs ** (corrPower - 1), 0)
+    m *= m_abs
+    return m
+
+
 def get_shift(ar1, ar2, corrPower=1):
     """
         Determine the relative shift between a pair of arrays giving the best overlap.
@@ -112,6 +112,96 @@ def upsampled_correlation(imageCorr, upsampleFactor, xyShift, device="cpu"):
     return xyShift
 
 
+def upsampled_correlation_batch(imageCorr, upsampleFactor, xyShifts, device="cpu"):
+    """
+    Refine several correlation peaks of imageCorr by DFT upsampling at once.
+
+    This gives the same results as calling `upsampled_correlation` on each row of
+    `xyShifts`, but computes the matrix multiply DFTs for all peaks together, so that
+    the transformation matrices are built in a single pass and the products with
+    imageCorr are done as one large matrix multiply.
+
+    Args:
+        imageCorr (complex valued ndarray):
+            Complex product of the FFTs of the two images to be registered
+        upsampleFactor (int):
+            Upsampling factor. Must be greater than 2.
+        xyShifts ((N,2) array):
+            Locations in original image coordinates around which to upsample the
+            FT, given to exactly half-pixel precision
+
+    Returns:
+        (N,2 np array): Refined locations of the peaks in image coordinates.
+    """
+
+    if device == "cpu":
+        xp = np
+    elif device == "gpu":
+        xp = cp
+
+    assert upsampleFactor > 2
+
+    xyShifts = xp.round(xp.asarray(xyShifts, dtype=float) * upsampleFactor)
+    xyShifts /= upsampleFactor
+
+    globalShift = xp.fix(xp.ceil(upsampleFactor * 1.5) / 2)
+
+    upsampleCenters = globalShift - upsampleFactor * xyShifts
+
+    # transformation matrices for all peaks, as in dftUpsample
+    imageSize = imageCorr.shape
+    numRow = int(np.ceil(1.5 * upsampleFactor))
+    numCol = numRow
+    numPeaks = xyShifts.shape[0]
+
+    rowKern = xp.exp(
+        (-1j * 2 * np.pi / (imageSize[0] * upsampleFactor))
+        * (
+            (xp.arange(numRow)[None, :, None] - upsampleCenters[:, 0, None, None])
+            * (xp.fft.ifftshift(xp.arange(imageSize[0])) - xp.floor(imageSize[0] / 2))
+        )
+    )
+    colKern = xp.exp(
+        (-1j * 2 * np.pi / (imageSize[1] * upsampleFactor))
+        * (
+            (xp.fft.ifftshift(xp.arange(imageSize[1])) - xp.floor(imageSize[1] / 2))[
+                None, :, None
+            ]
+            * (xp.arange(numCol)[None, None, :] - upsampleCenters[:, 1, None, None])
+        )
+    )
+
+    imageCorrUpsample = (
+        rowKern.reshape(numPeaks * numRow, imageSize[0]) @ xp.conj(imageCorr)
+    ).reshape(numPeaks, numRow, imageSize[1])
+    imageCorrUpsample = xp.real(imageCorrUpsample @ colKern)
+
+    xySubShifts = xp.stack(
+        xp.unravel_index(
+            imageCorrUpsample.reshape(numPeaks, numRow * numCol).argmax(axis=1),
+            (numRow, numCol),
+        ),
+        axis=1,
+    )
+
+    # add a subpixel shift via parabolic fitting, except for peaks on the edge of
+    # the upsampled region
+    dxy = xp.zeros((numPeaks, 2))
+    inner = xp.all((xySubShifts >= 1) & (xySubShifts <= numRow - 2), axis=1)
+    if xp.any(inner):
+        p = xp.nonzero(inner)[0]
+        x, y = xySubShifts[p, 0], xySubShifts[p, 1]
+        icc = imageCorrUpsample[p, x, y]
+        icc_xm, icc_xp = imageCorrUpsample[p, x - 1, y], imageCorrUpsample[p, x + 1, y]
+        icc_ym, icc_yp = imageCorrUpsample[p, x, y - 1], imageCorrUpsample[p, x, y + 1]
+        dxy[p, 0] = (icc_xp - icc_xm) / (4 * icc - 2 * icc_xp - 2 * icc_xm)
+        dxy[p, 1] = (icc_yp - icc_ym) / (4 * icc - 2 * icc_yp - 2 * icc_ym)
+
+    xySubShifts = xySubShifts - globalShift
+
+    return xyShifts + (xySubShifts + dxy) / upsampleFactor
+
+
 def upsampleFFT(cc, device="cpu"):
     """
     Zero-padding FFT upsampling. Returns the real IFFT of the input with 2x
@@ -2,21 +2,30 @@
 
 import numpy as np
 from numpy.fft import fftfreq, fftshift
+from scipy.fft import fft2, ifft2, rfft2
 from scipy.ndimage import gaussian_filter
 from scipy.spatial import Voronoi
 import math as ma
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 from mpl_toolkits.axes_grid1.anchored_artists import AnchoredSizeBar
 import matplotlib.font_manager as fm
 
 from emdfile import tqdmnd
+from py4DSTEM.utils.numba_utils import _as_native, _numba_supports
 
 try:
     import cupy as cp
 except (ModuleNotFoundError, ImportError):
     cp = np
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 
 def radial_reduction(ar, x0, y0, binsize=1, fn=np.mean, coords=None):
     """
@@ -48,6 +57,20 @@ def radial_reduction(ar, x0, y0, binsize=1, fn=np.mean, coords=None):
     return reductions
 
 
+_cmap_cache = {}
+
+
+def _get_cmap(cmap):
+    """
+    Returns the colormap `cmap`, caching colormaps looked up by name.
+    """
+    if not isinstance(cmap, str):
+        return plt.get_cmap(cmap)
+    if cmap not in _cmap_cache:
+        _cmap_cache[cmap] = plt.get_cmap(cmap)
+    return _cmap_cache[cmap]
+
+
 def plot(
     img,
     title="Image",
@@ -57,12 +80,19 @@ def plot(
     vmax=None,
     figsize=(10, 10),
     scale=None,
+    save_eps=True,
 ):
-    fig, ax = plt.subplots(figsize=figsize)
-    im = ax.imshow(img, interpolation="nearest", cmap=plt.get_cmap(cmap), vmax=vmax)
+    if show:
+        fig, ax = plt.subplots(figsize=figsize)
+    else:
+        # figures which are only saved are drawn with Agg, without pyplot
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        ax = fig.subplots()
+    im = ax.imshow(img, interpolation="nearest", cmap=_get_cmap(cmap), vmax=vmax)
     divider = make_axes_locatable(ax)
     cax = divider.append_axes("right", size="5%", pad=0.05)
-    plt.colorbar(im, cax=cax)
+    fig.colorbar(im, cax=cax)
     ax.set_title(title)
     fontprops = fm.FontProperties(size=18)
     if scale is not None:
@@ -82,7 +112,8 @@ def plot(
     ax.grid(False)
     if savePath is not None:
         fig.savefig(savePath + ".png", dpi=600)
-        fig.savefig(savePath + ".eps", dpi=600)
+        if save_eps:
+            fig.savefig(savePath + ".eps", dpi=600)
     if show:
         plt.show()
 
@@ -126,22 +157,24 @@ def sector_mask(shape, centre, radius, angle_range=(0, 360)):
     if tmax < tmin:
         tmax += 2 * np.pi
 
-    # convert cartesian --> polar coordinates
-    r2 = (x - cx) * (x - cx) + (y - cy) * (y - cy)
-    theta = np.arctan2(x - cx, y - cy) - tmin
+    # wrap the start angle into (-pi, pi], so that arctan2(...) - tmin lies in
+    # (-2*pi, 2*pi) and a single conditional add of 2*pi replaces the modulo
+    span = tmax - tmin
+    tmin = np.pi - (np.pi - tmin) % (2 * np.pi)
 
-    # wrap angles between 0 and 2*pi
-    theta %= 2 * np.pi
-
-    # circular mask
-    circmask = r2 <= radius * radius
-
-    # print 'radius - ', radius
+    # convert cartesian --> polar coordinates
+    dx = x - cx
+    dy = y - cy
+    r2 = dx * dx + dy * dy
+    theta = np.arctan2(dx, dy)
+    theta -= tmin
+    np.add(theta, 2 * np.pi, out=theta, where=theta < 0)
 
-    # angular mask
-    anglemask = theta < (tmax - tmin)
+    # circular and angular masks
+    mask = r2 <= radius * radius
+    mask &= theta < span
 
-    return circmask * anglemask
+    return mask
 
 
 def get_qx_qy_1d(M, dx=[1, 1], fft_shifted=False):
@@ -176,6 +209,11 @@ def get_CoM(ar, device="cpu", corner_centered=False):
     ar = xp.asarray(ar)
     nx, ny = ar.shape
 
+    if njit is not None and xp is np:
+        ar = _as_native(ar)
+        if _numba_supports(ar.dtype):
+            return _get_CoM(ar, corner_centered)
+
     if corner_centered:
         ry, rx = xp.meshgrid(xp.fft.fftfreq(ny, 1 / ny), xp.fft.fftfreq(nx, 1 / nx))
     else:
@@ -187,6 +225,29 @@ def get_CoM(ar, device="cpu", corner_centered=False):
     return xCoM, yCoM
 
 
+if njit is not None:
+
+    @njit(cache=True, error_model="numpy")
+    def _get_CoM(ar, corner_centered):
+        nx, ny = ar.shape
+        tot_intens = 0.0
+        x_sum = 0.0
+        y_sum = 0.0
+        for i in range(nx):
+            rx = i - nx if (corner_centered and i >= (nx + 1) // 2) else i
+            row_sum = 0.0
+            y_row_sum = 0.0
+            for j in range(ny):
+                ry = j - ny if (corner_centered and j >= (ny + 1) // 2) else j
+                v = ar[i, j]
+                row_sum += v
+                y_row_sum += ry * v
+            tot_intens += row_sum
+            x_sum += rx * row_sum
+            y_sum += y_row_sum
+        return x_sum / tot_intens, y_sum / tot_intens
+
+
 def get_maxima_1D(ar, sigma=0, minSpacing=0, minRelativeIntensity=0, relativeToPeak=0):
     """
     Finds the indices where 1D array ar is a local maximum.
@@ -217,28 +278,30 @@ def get_maxima_1D(ar, sigma=0, minSpacing=0, minRelativeIntensity=0, relativeToP
     x = np.arange(len(ar))[maxima_bool]
     intensity = ar[maxima_bool]
 
-    # Sort by intensity
-    temp_ar = np.array(
-        [(x, inten) for inten, x in sorted(zip(intensity, x), reverse=True)]
-    )
-    x, intensity = temp_ar[:, 0], temp_ar[:, 1]
+    # Sort by intensity, breaking ties by position, both in descending order
+    order = np.lexsort((x, intensity))[::-1]
+    x, intensity = x[order], intensity[order]
 
     # Remove points which are too close
     if minSpacing > 0:
         deletemask = np.zeros(len(x), dtype=bool)
-        for i in range(len(x)):
+        # find the maxima within minSpacing of each maximum
+        order = np.argsort(x, kind="stable")
+        x_sorted = x[order]
+        starts = np.searchsorted(x_sorted, x - minSpacing, side="right")
+        ends = np.searchsorted(x_sorted, x + minSpacing, side="left")
+        for i in np.nonzero(ends - starts > 1)[0]:
             if not deletemask[i]:
-                delete = np.abs(x[i] - x) < minSpacing
-                delete[: i + 1] = False
-                deletemask = deletemask | delete
-        x = np.delete(x, deletemask.nonzero()[0])
-        intensity = np.delete(intensity, deletemask.nonzero()[0])
+                neighbors = order[starts[i] : ends[i]]
+                deletemask[neighbors[neighbors > i]] = True
+        x = x[~deletemask]
+        intensity = intensity[~deletemask]
 
     # Remove points which are too dim
     if minRelativeIntensity > 0:
         deletemask = intensity / intensity[relativeToPeak] < minRelativeIntensity
-        x = np.delete(x, deletemask.nonzero()[0])
-        intensity = np.delete(intensity, deletemask.nonzero()[0])
+        x = x[~deletemask]
+        intensity = intensity[~deletemask]
 
     return x.astype(int)
 
@@ -258,22 +321,58 @@ def add_to_2D_array_from_floats(ar, x, y, I):
     Adds the values I to array ar, distributing the value between the four pixels nearest
     (x,y) using linear interpolation.  Inputs (x,y,I) may be floats or arrays of floats.
 
-    Note that if the same [x,y] coordinate appears more than once in the input array,
-    only the *final* value of I at that coordinate will get added.
+    If the same [x,y] coordinate appears more than once in the input array, all the
+    values of I at that coordinate are added.
     """
+    x, y, I = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(x, dtype=np.float64)),
+        np.atleast_1d(np.asarray(y, dtype=np.float64)),
+        np.atleast_1d(I),
+    )
+    x, y, I = x.ravel(), y.ravel(), _as_native(I.ravel())
+    # as with +=, the interpolated values may not be truncated to fit ar
+    dtype = np.result_type(I.dtype, np.float64)
+    if not np.can_cast(dtype, ar.dtype, casting="same_kind"):
+        raise TypeError(
+            f"Cannot add values of dtype {dtype} to an array of dtype {ar.dtype}"
+        )
+    if njit is not None and _numba_supports(ar.dtype) and _numba_supports(I.dtype):
+        _add_to_2D_array_from_floats(ar, x, y, I)
+    else:
+        _add_to_2D_array_from_floats_numpy(ar, x, y, I)
+    return ar
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _add_to_2D_array_from_floats(ar, x, y, I):
+        Nx, Ny = ar.shape
+        for k in range(x.shape[0]):
+            x0, x1 = int(np.floor(x[k])), int(np.ceil(x[k]))
+            y0, y1 = int(np.floor(y[k])), int(np.ceil(y[k]))
+            if x0 >= 0 and y0 >= 0 and x1 < Nx and y1 < Ny:
+                dx = x[k] - x0
+                dy = y[k] - y0
+                ar[x0, y0] += (1 - dx) * (1 - dy) * I[k]
+                ar[x0, y1] += (1 - dx) * dy * I[k]
+                ar[x1, y0] += dx * (1 - dy) * I[k]
+                ar[x1, y1] += dx * dy * I[k]
+
+
+def _add_to_2D_array_from_floats_numpy(ar, x, y, I):
     Nx, Ny = ar.shape
     x0, x1 = (np.floor(x)).astype(int), (np.ceil(x)).astype(int)
     y0, y1 = (np.floor(y)).astype(int), (np.ceil(y)).astype(int)
-    mask = np.logical_and(
-        np.logical_and(np.logical_and((x0 >= 0), (y0 >= 0)), (x1 < Nx)), (y1 < Ny)
-    )
-    dx = x - x0
-    dy = y - y0
-    ar[x0[mask], y0[mask]] += (1 - dx[mask]) * (1 - dy[mask]) * I[mask]
-    ar[x0[mask], y1[mask]] += (1 - dx[mask]) * (dy[mask]) * I[mask]
-    ar[x1[mask], y0[mask]] += (dx[mask]) * (1 - dy[mask]) * I[mask]
-    ar[x1[mask], y1[mask]] += (dx[mask]) * (dy[mask]) * I[mask]
-    return ar
+    mask = (x0 >= 0) & (y0 >= 0) & (x1 < Nx) & (y1 < Ny)
+    x0, x1, y0, y1 = x0[mask], x1[mask], y0[mask], y1[mask]
+    dx = x[mask] - x0
+    dy = y[mask] - y0
+    I = I[mask]
+    np.add.at(ar, (x0, y0), (1 - dx) * (1 - dy) * I)
+    np.add.at(ar, (x0, y1), (1 - dx) * dy * I)
+    np.add.at(ar, (x1, y0), dx * (1 - dy) * I)
+    np.add.at(ar, (x1, y1), dx * dy * I)
 
 
 def get_voronoi_vertices(voronoi, nx, ny, dist=10):
@@ -316,28 +415,25 @@ def get_voronoi_vertices(voronoi, nx, ny, dist=10):
                 [max(ridge), voronoi.ridge_points[i, 0], voronoi.ridge_points[i, 1]]
             )
     edgeridge_vertices_and_points = np.array(edgeridge_vertices_and_points)
+    # Map each known vertex index to its edge ridge row
+    edge_lookup = {int(row[0]): row for row in edgeridge_vertices_and_points}
 
     # Loop over all regions
     for index in range(len(voronoi.regions)):
         # Get the vertex indices
         vertex_indices = voronoi.regions[index]
-        vertices = np.array([0, 0])
+        verts_list = []
         # Loop over all vertices
         for i in range(len(vertex_indices)):
             index_current = vertex_indices[i]
             if index_current != -1:
                 # For known vertices, just add to a running list
-                vertices = np.vstack((vertices, voronoi.vertices[index_current]))
+                verts_list.append(voronoi.vertices[index_current])
             else:
                 # For unknown vertices, get the first vertex it connects to,
                 # and the two voronoi points that this ridge divides
                 index_prev = vertex_indices[(i - 1) % len(vertex_indices)]
-                edgeridge_index = int(
-                    np.argwhere(edgeridge_vertices_and_points[:, 0] == index_prev)
-                )
-                index_vert, region0, region1 = edgeridge_vertices_and_points[
-                    edgeridge_index, :
-                ]
+                index_vert, region0, region1 = edge_lookup[index_prev]
                 x, y = voronoi.vertices[index_vert]
                 # Only add new points for unknown vertices if the known index it connects to
                 # is inside the frame.  Add points by finding the line segment starting at
@@ -353,7 +449,7 @@ def get_voronoi_vertices(voronoi, nx, ny, dist=10):
                     y_t = lambda t: y + m * t
                     t = ts[np.argmin(np.hypot(x - x_t(ts), y - y_t(ts)))]
                     x_new, y_new = x_t(dist * t), y_t(dist * t)
-                    vertices = np.vstack((vertices, np.array([x_new, y_new])))
+                    verts_list.append(np.array([x_new, y_new]))
                 else:
                     # If handling unknown points connecting to points outside the frame is
                     # desired, add here
@@ -361,12 +457,7 @@ def get_voronoi_vertices(voronoi, nx, ny, dist=10):
 
                 # Repeat for the second vertec the unknown vertex connects to
                 index_next = vertex_indices[(i + 1) % len(vertex_indices)]
-                edgeridge_index = int(
-                    np.argwhere(edgeridge_vertices_and_points[:, 0] == index_next)
-                )
-                index_vert, region0, region1 = edgeridge_vertices_and_points[
-                    edgeridge_index, :
-                ]
+                index_vert, region0, region1 = edge_lookup[index_next]
                 x, y = voronoi.vertices[index_vert]
                 if (x > 0) and (x < nx) and (y > 0) and (y < ny):
                     x_r0, y_r0 = voronoi.points[region0]
@@ -378,16 +469,15 @@ def get_voronoi_vertices(voronoi, nx, ny, dist=10):
                     y_t = lambda t: y + m * t
                     t = ts[np.argmin(np.hypot(x - x_t(ts), y - y_t(ts)))]
                     x_new, y_new = x_t(dist * t), y_t(dist * t)
-                    vertices = np.vstack((vertices, np.array([x_new, y_new])))
+                    verts_list.append(np.array([x_new, y_new]))
                 else:
                     pass
 
         # Remove regions with insufficiently many vertices
-        if len(vertices) < 4:
+        if len(verts_list) < 3:
             vertices = np.array([])
-        # Remove initial dummy point
         else:
-            vertices = vertices[1:, :]
+            vertices = np.asarray(verts_list)
         # Update vertex list with this region's vertices
         vertex_list.append(vertices)
 
@@ -403,10 +493,22 @@ def get_ewpc_filter_function(Q_Nx, Q_Ny):
     units!) See https://arxiv.org/abs/1911.00984
     """
     h = np.hanning(Q_Nx)[:, np.newaxis] * np.hanning(Q_Ny)[np.newaxis, :]
-    return (
-        lambda x: np.abs(np.fft.fftshift(np.fft.fft2(h * np.log(np.maximum(x, 0.01)))))
-        ** 2
-    )
+
+    # the power spectrum of a real array is symmetric, so only half is computed
+    x_inds_reflected = -np.arange(Q_Nx) % Q_Nx
+    ny_half = Q_Ny // 2 + 1
+
+    def ewpc_filter_function(x):
+        ar = np.maximum(x, 0.01)
+        np.log(ar, out=ar)
+        ar = rfft2(h * ar, overwrite_x=True)
+
+        power = np.empty((Q_Nx, Q_Ny))
+        power[:, :ny_half] = ar.real**2 + ar.imag**2
+        power[:, ny_half:] = power[x_inds_reflected, 1 : (Q_Ny + 1) // 2][:, ::-1]
+        return np.fft.fftshift(power)
+
+    return ewpc_filter_function
 
 
 def fourier_resample(
@@ -578,56 +680,42 @@ def fourier_resample(
         y_lr_out = slice(None)
         y_lr_in_ = slice(None)
 
-    if len(array.shape) == 2:
-        # image array
-        array_resize = np.zeros(output_size, dtype=np.complex64)
-        array_fft = np.fft.fft2(array)
+    def resample_FT(ar):
+        # resample the last two axes of ar, broadcasting over any leading axes
+        array_fft = fft2(ar, axes=(-2, -1), workers=-1)
+        array_output = np.zeros(ar.shape[:-2] + tuple(output_size), dtype=np.complex64)
 
         # copy each quadrant into the resize array
-        array_resize[x_ul_out, y_ul_out] = array_fft[x_ul_in_, y_ul_in_]
-        array_resize[x_ll_out, y_ll_out] = array_fft[x_ll_in_, y_ll_in_]
-        array_resize[x_ur_out, y_ur_out] = array_fft[x_ur_in_, y_ur_in_]
-        array_resize[x_lr_out, y_lr_out] = array_fft[x_lr_in_, y_lr_in_]
+        array_output[..., x_ul_out, y_ul_out] = array_fft[..., x_ul_in_, y_ul_in_]
+        array_output[..., x_ll_out, y_ll_out] = array_fft[..., x_ll_in_, y_ll_in_]
+        array_output[..., x_ur_out, y_ur_out] = array_fft[..., x_ur_in_, y_ur_in_]
+        array_output[..., x_lr_out, y_lr_out] = array_fft[..., x_lr_in_, y_lr_in_]
 
         # Band limit if needed
         if bandlimit_nyquist is not None:
-            array_resize *= k_filt
+            array_output *= k_filt
 
         # Back to real space
-        array_resize = np.real(np.fft.ifft2(array_resize)).astype(dtype)
+        return np.real(ifft2(array_output, axes=(-2, -1), workers=-1, overwrite_x=True))
+
+    if len(array.shape) == 2:
+        # image array
+        array_resize = resample_FT(array).astype(dtype)
 
     elif len(array.shape) == 4:
-        # This case is the same as the 2D case, but loops over the probe index arrays
+        # This case is the same as the 2D case, but transforms one row of
+        # diffraction patterns at a time
 
         # init arrays
         array_resize = np.zeros((*array.shape[:2], *output_size), dtype)
-        array_fft = np.zeros(input__size, dtype=np.complex64)
-        array_output = np.zeros(output_size, dtype=np.complex64)
 
-        for Rx, Ry in tqdmnd(
+        for Rx in tqdmnd(
             array.shape[0],
-            array.shape[1],
             desc="Resampling 4D datacube",
-            unit="DP",
+            unit="row",
             unit_scale=True,
         ):
-            array_fft[:, :] = np.fft.fft2(array[Rx, Ry, :, :])
-            array_output[:, :] = 0
-
-            # copy each quadrant into the resize array
-            array_output[x_ul_out, y_ul_out] = array_fft[x_ul_in_, y_ul_in_]
-            array_output[x_ll_out, y_ll_out] = array_fft[x_ll_in_, y_ll_in_]
-            array_output[x_ur_out, y_ur_out] = array_fft[x_ur_in_, y_ur_in_]
-            array_output[x_lr_out, y_lr_out] = array_fft[x_lr_in_, y_lr_in_]
-
-            # Band limit if needed
-            if bandlimit_nyquist is not None:
-                array_output *= k_filt
-
-            # Back to real space
-            array_resize[Rx, Ry, :, :] = np.real(np.fft.ifft2(array_output)).astype(
-                dtype
-            )
+            array_resize[Rx] = resample_FT(array[Rx])
 
     # Enforce positivity if needed, after filtering
     if force_nonnegative:
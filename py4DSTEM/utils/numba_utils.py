@@ -0,0 +1,27 @@
+# Helpers for dispatching arrays to py4DSTEM's numba kernels
+
+import numpy as np
+
+
+def _numba_supports(dtype):
+    """
+    Whether py4DSTEM's numba kernels are compiled for dtype: they take
+    native-endian real dtypes other than float16.
+    """
+    dtype = np.dtype(dtype)
+    return dtype.isnative and dtype.kind in "biuf" and dtype != np.float16
+
+
+def _as_native(ar):
+    """
+    Returns ar as an ndarray the numba kernels can take if a cast preserving its
+    values exists, casting big-endian arrays to native byte order and float16
+    arrays to float32. Other arrays, e.g. complex ones, are returned unchanged,
+    and callers should check them with _numba_supports.
+    """
+    ar = np.asarray(ar)
+    if _numba_supports(ar.dtype) or ar.dtype.kind not in "biuf":
+        return ar
+    if ar.dtype == np.float16:
+        return ar.astype(np.float32)
+    return ar.astype(ar.dtype.newbyteorder("="))
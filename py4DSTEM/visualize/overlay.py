@@ -1,14 +1,30 @@
 import numpy as np
 from matplotlib.patches import Rectangle, Circle, Wedge, Ellipse
+from matplotlib.collections import PatchCollection
 from matplotlib.axes import Axes
-from matplotlib.colors import is_color_like
-from numbers import Number
+from matplotlib.colors import is_color_like, to_rgba, to_rgba_array
+from numbers import Number, Real
 from math import log
 from fractions import Fraction
 
 from emdfile import PointList
 
 
+def _get_param_list(d, key, default, N, types):
+    """
+    Returns the parameter d[key] (or default, if key is not in d) as a length N
+    list. Values of the given types are repeated N times; otherwise the value must
+    be a length N list of values of these types.
+    """
+    x = d.get(key, default)
+    if isinstance(x, types):
+        return [x] * N
+    assert isinstance(x, list)
+    assert len(x) == N
+    assert all(isinstance(i, types) for i in x)
+    return x
+
+
 def add_rectangles(ax, d):
     """
     Adds one or more rectangles to Axis ax using the parameters in dictionary d.
@@ -23,40 +39,21 @@ def add_rectangles(ax, d):
         lims = [lims]
     assert isinstance(lims, list)
     N = len(lims)
-    assert all([isinstance(t, tuple) for t in lims])
-    assert all([len(t) == 4 for t in lims])
+    assert all(isinstance(t, tuple) and len(t) == 4 for t in lims)
     # color
     color = d["color"] if "color" in d.keys() else "r"
     if isinstance(color, list):
         assert len(color) == N
-        assert all([is_color_like(c) for c in color])
+        assert all(is_color_like(c) for c in color)
     else:
         assert is_color_like(color)
-        color = [color for i in range(N)]
+        color = [color] * N
     # fill
-    fill = d["fill"] if "fill" in d.keys() else False
-    if isinstance(fill, bool):
-        fill = [fill for i in range(N)]
-    else:
-        assert isinstance(fill, list)
-        assert len(fill) == N
-        assert all([isinstance(f, bool) for f in fill])
+    fill = _get_param_list(d, "fill", False, N, bool)
     # alpha
-    alpha = d["alpha"] if "alpha" in d.keys() else 1
-    if isinstance(alpha, (float, int, np.float64)):
-        alpha = [alpha for i in range(N)]
-    else:
-        assert isinstance(alpha, list)
-        assert len(alpha) == N
-        assert all([isinstance(a, (float, int, np.float64)) for a in alpha])
+    alpha = _get_param_list(d, "alpha", 1, N, Real)
     # linewidth
-    linewidth = d["linewidth"] if "linewidth" in d.keys() else 2
-    if isinstance(linewidth, (float, int, np.float64)):
-        linewidth = [linewidth for i in range(N)]
-    else:
-        assert isinstance(linewidth, list)
-        assert len(linewidth) == N
-        assert all([isinstance(lw, (float, int, np.float64)) for lw in linewidth])
+    linewidth = _get_param_list(d, "linewidth", 2, N, Real)
     # additional parameters
     kws = [
         k for k in d.keys() if k not in ("lims", "color", "fill", "alpha", "linewidth")
@@ -83,6 +80,19 @@ def add_rectangles(ax, d):
     return
 
 
+def _add_patches(ax, patches, kwargs):
+    """
+    Adds the list of patches to Axis ax. Patches without additional style kwargs,
+    which a PatchCollection can reproduce, are drawn as a single collection.
+    Collections are not pixel-snapped, so this is not used for rectangles.
+    """
+    if len(patches) > 1 and all(k in ("linestyle", "ls") for k in kwargs):
+        ax.add_collection(PatchCollection(patches, match_original=True))
+    else:
+        for patch in patches:
+            ax.add_patch(patch)
+
+
 def add_circles(ax, d):
     """
     adds one or more circles to axis ax using the parameters in dictionary d.
@@ -97,48 +107,29 @@ def add_circles(ax, d):
         center = [center]
     assert isinstance(center, list)
     N = len(center)
-    assert all([isinstance(x, tuple) for x in center])
-    assert all([len(x) == 2 for x in center])
+    assert all(isinstance(x, tuple) and len(x) == 2 for x in center)
     # radius
     assert "R" in d.keys()
     R = d["R"]
     if isinstance(R, Number):
-        R = [R for i in range(N)]
+        R = [R] * N
     assert isinstance(R, list)
     assert len(R) == N
-    assert all([isinstance(i, Number) for i in R])
+    assert all(isinstance(i, Number) for i in R)
     # color
     color = d["color"] if "color" in d.keys() else "r"
     if isinstance(color, list):
         assert len(color) == N
-        assert all([is_color_like(c) for c in color])
+        assert all(is_color_like(c) for c in color)
     else:
         assert is_color_like(color)
-        color = [color for i in range(N)]
+        color = [color] * N
     # fill
-    fill = d["fill"] if "fill" in d.keys() else False
-    if isinstance(fill, bool):
-        fill = [fill for i in range(N)]
-    else:
-        assert isinstance(fill, list)
-        assert len(fill) == N
-        assert all([isinstance(f, bool) for f in fill])
+    fill = _get_param_list(d, "fill", False, N, bool)
     # alpha
-    alpha = d["alpha"] if "alpha" in d.keys() else 1
-    if isinstance(alpha, (float, int, np.float64)):
-        alpha = [alpha for i in range(N)]
-    else:
-        assert isinstance(alpha, list)
-        assert len(alpha) == N
-        assert all([isinstance(a, (float, int, np.float64)) for a in alpha])
+    alpha = _get_param_list(d, "alpha", 1, N, Real)
     # linewidth
-    linewidth = d["linewidth"] if "linewidth" in d.keys() else 2
-    if isinstance(linewidth, (float, int, np.float64)):
-        linewidth = [linewidth for i in range(N)]
-    else:
-        assert isinstance(linewidth, list)
-        assert len(linewidth) == N
-        assert all([isinstance(lw, (float, int, np.float64)) for lw in linewidth])
+    linewidth = _get_param_list(d, "linewidth", 2, N, Real)
     # additional parameters
     kws = [
         k
@@ -150,6 +141,7 @@ def add_circles(ax, d):
         kwargs[k] = d[k]
 
     # add the circles
+    circs = []
     for i in range(N):
         cent, r, col, f, a, lw = (
             center[i],
@@ -162,7 +154,8 @@ def add_circles(ax, d):
         circ = Circle(
             (cent[1], cent[0]), r, color=col, fill=f, alpha=a, linewidth=lw, **kwargs
         )
-        ax.add_patch(circ)
+        circs.append(circ)
+    _add_patches(ax, circs, kwargs)
 
     return
 
@@ -194,8 +187,7 @@ def add_annuli(ax, d):
         assert len(center) == 2
         center = [center] * N
     # assert(isinstance(center,list))
-    assert all([isinstance(x, tuple) for x in center])
-    assert all([len(x) == 2 for x in center])
+    assert all(isinstance(x, tuple) and len(x) == 2 for x in center)
     # radii
     if isinstance(radii, tuple):
         assert len(radii) == 2
@@ -203,44 +195,26 @@ def add_annuli(ax, d):
         ro = [radii[1] for i in range(N)]
     else:
         assert isinstance(radii, list)
-        assert all([isinstance(x, tuple) for x in radii])
+        assert all(isinstance(x, tuple) for x in radii)
         assert len(radii) == N
         ri = [radii[i][0] for i in range(N)]
         ro = [radii[i][1] for i in range(N)]
-    assert all([isinstance(i, Number) for i in ri])
-    assert all([isinstance(i, Number) for i in ro])
+    assert all(isinstance(i, Number) for i in ri)
+    assert all(isinstance(i, Number) for i in ro)
     # color
     color = d["color"] if "color" in d.keys() else "r"
     if isinstance(color, list):
         assert len(color) == N
-        assert all([is_color_like(c) for c in color])
+        assert all(is_color_like(c) for c in color)
     else:
         assert is_color_like(color)
-        color = [color for i in range(N)]
+        color = [color] * N
     # fill
-    fill = d["fill"] if "fill" in d.keys() else True
-    if isinstance(fill, bool):
-        fill = [fill for i in range(N)]
-    else:
-        assert isinstance(fill, list)
-        assert len(fill) == N
-        assert all([isinstance(f, bool) for f in fill])
+    fill = _get_param_list(d, "fill", True, N, bool)
     # alpha
-    alpha = d["alpha"] if "alpha" in d.keys() else 1
-    if isinstance(alpha, (float, int, np.float64)):
-        alpha = [alpha for i in range(N)]
-    else:
-        assert isinstance(alpha, list)
-        assert len(alpha) == N
-        assert all([isinstance(a, (float, int, np.float64)) for a in alpha])
+    alpha = _get_param_list(d, "alpha", 1, N, Real)
     # linewidth
-    linewidth = d["linewidth"] if "linewidth" in d.keys() else 2
-    if isinstance(linewidth, (float, int, np.float64)):
-        linewidth = [linewidth for i in range(N)]
-    else:
-        assert isinstance(linewidth, list)
-        assert len(linewidth) == N
-        assert all([isinstance(lw, (float, int, np.float64)) for lw in linewidth])
+    linewidth = _get_param_list(d, "linewidth", 2, N, Real)
     # additional parameters
     kws = [
         k
@@ -252,6 +226,7 @@ def add_annuli(ax, d):
         kwargs[k] = d[k]
 
     # add the annuli
+    annuli = []
     for i in range(N):
         cent, Ri, Ro, col, f, a, lw = (
             center[i],
@@ -274,7 +249,8 @@ def add_annuli(ax, d):
             linewidth=lw,
             **kwargs,
         )
-        ax.add_patch(annulus)
+        annuli.append(annulus)
+    _add_patches(ax, annuli, kwargs)
 
     return
 
@@ -303,7 +279,7 @@ def add_ellipses(ax, d):
         a = [a]
     assert isinstance(a, list)
     N = len(a)
-    assert all([isinstance(i, Number) for i in a])
+    assert all(isinstance(i, Number) for i in a)
     # semiminor axis length
     assert "b" in d.keys()
     b = d["b"]
@@ -311,65 +287,40 @@ def add_ellipses(ax, d):
         b = [b]
     assert isinstance(b, list)
     assert len(b) == N
-    assert all([isinstance(i, Number) for i in b])
+    assert all(isinstance(i, Number) for i in b)
     # center
     assert "center" in d.keys()
     center = d["center"]
     if isinstance(center, tuple):
         assert len(center) == 2
-        center = [center for i in range(N)]
+        center = [center] * N
     assert isinstance(center, list)
     assert len(center) == N
-    assert all([isinstance(x, tuple) for x in center])
-    assert all([len(x) == 2 for x in center])
+    assert all(isinstance(x, tuple) and len(x) == 2 for x in center)
     # theta
     assert "theta" in d.keys()
     theta = d["theta"]
     if isinstance(theta, Number):
-        theta = [theta for i in range(N)]
+        theta = [theta] * N
     assert isinstance(theta, list)
     assert len(theta) == N
-    assert all([isinstance(i, Number) for i in theta])
+    assert all(isinstance(i, Number) for i in theta)
     # color
     color = d["color"] if "color" in d.keys() else "r"
     if isinstance(color, list):
         assert len(color) == N
-        assert all([is_color_like(c) for c in color])
+        assert all(is_color_like(c) for c in color)
     else:
         assert is_color_like(color)
-        color = [color for i in range(N)]
+        color = [color] * N
     # fill
-    fill = d["fill"] if "fill" in d.keys() else False
-    if isinstance(fill, bool):
-        fill = [fill for i in range(N)]
-    else:
-        assert isinstance(fill, list)
-        assert len(fill) == N
-        assert all([isinstance(f, bool) for f in fill])
+    fill = _get_param_list(d, "fill", False, N, bool)
     # alpha
-    alpha = d["alpha"] if "alpha" in d.keys() else 1
-    if isinstance(alpha, (float, int, np.float64)):
-        alpha = [alpha for i in range(N)]
-    else:
-        assert isinstance(alpha, list)
-        assert len(alpha) == N
-        assert all([isinstance(alp, (float, int, np.float64)) for alp in alpha])
+    alpha = _get_param_list(d, "alpha", 1, N, Real)
     # linewidth
-    linewidth = d["linewidth"] if "linewidth" in d.keys() else 2
-    if isinstance(linewidth, (float, int, np.float64)):
-        linewidth = [linewidth for i in range(N)]
-    else:
-        assert isinstance(linewidth, list)
-        assert len(linewidth) == N
-        assert all([isinstance(lw, (float, int, np.float64)) for lw in linewidth])
+    linewidth = _get_param_list(d, "linewidth", 2, N, Real)
     # linestyle
-    linestyle = d["linestyle"] if "linestyle" in d.keys() else "-"
-    if isinstance(linestyle, (str)):
-        linestyle = [linestyle for i in range(N)]
-    else:
-        assert isinstance(linestyle, list)
-        assert len(linestyle) == N
-        assert all([isinstance(lw, (str)) for lw in linestyle])
+    linestyle = _get_param_list(d, "linestyle", "-", N, str)
     # additional parameters
     kws = [
         k
@@ -392,6 +343,7 @@ def add_ellipses(ax, d):
         kwargs[k] = d[k]
 
     # add the ellipses
+    ellipses = []
     for i in range(N):
         cent, _a, _b, _theta, col, f, _alpha, lw, ls = (
             center[i],
@@ -416,7 +368,8 @@ def add_ellipses(ax, d):
             linestyle=ls,
             **kwargs,
         )
-        ax.add_patch(ellipse)
+        ellipses.append(ellipse)
+    _add_patches(ax, ellipses, kwargs)
 
     return
 
@@ -442,11 +395,11 @@ def add_points(ax, d):
     y = np.array(y)
     assert len(y) == N
     # s
-    s = d["s"] if "s" in d.keys() else np.ones(N)
-    if isinstance(s, Number):
-        s = np.ones_like(x) * s
-    assert len(s) == N
-    s = np.where(s > 0, s, 0)
+    s = d["s"] if "s" in d.keys() else 1
+    if not isinstance(s, Number):
+        s = np.asarray(s)
+        assert len(s) == N
+        s = np.where(s > 0, s, 0)
     # scale
     scale = d["scale"] if "scale" in d.keys() else 25
     assert isinstance(scale, Number)
@@ -454,10 +407,14 @@ def add_points(ax, d):
     color = d["pointcolor"] if "pointcolor" in d.keys() else "r"
     if isinstance(color, (list, np.ndarray)):
         assert len(color) == N
-        assert all([is_color_like(c) for c in color])
+        color = to_rgba_array(color)
     else:
         assert is_color_like(color)
-        color = [color for i in range(N)]
+        # one RGBA row per point, rather than a single color: scatter renders a
+        # single-colored collection through Agg's draw_markers, which
+        # rasterizes the points differently from the per-point colors used
+        # before, so this keeps plots pixel-identical
+        color = np.tile(to_rgba(color), (N, 1))
     # alpha
     alpha = d["alpha"] if "alpha" in d.keys() else 1.0
     assert isinstance(alpha, Number)
@@ -480,7 +437,12 @@ def add_points(ax, d):
             y, x, s=scale, edgecolor=color, facecolor="none", alpha=alpha, **kwargs
         )
     else:
-        ax.scatter(y, x, s=s * scale / np.max(s), color=color, alpha=alpha, **kwargs)
+        # marker sizes are scaled so the largest is `scale`
+        if isinstance(s, Number):
+            sizes = scale if s > 0 else 0
+        else:
+            sizes = s * (scale / np.max(s))
+        ax.scatter(y, x, s=sizes, color=color, alpha=alpha, **kwargs)
 
     return
 
@@ -10,6 +10,7 @@ from matplotlib.colors import is_color_like
 from matplotlib.figure import Figure
 from mpl_toolkits.axes_grid1.axes_divider import make_axes_locatable
 from py4DSTEM.data import Calibration, DiffractionSlice, RealSlice
+from py4DSTEM.utils.numba_utils import _as_native, _numba_supports
 from py4DSTEM.visualize.overlay import (
     add_annuli,
     add_cartesian_grid,
@@ -23,6 +24,11 @@ from py4DSTEM.visualize.overlay import (
     add_scalebar,
 )
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 
 def show(
     ar,
@@ -47,6 +53,7 @@ def show(
     returncax=False,
     returnfig=False,
     figax=None,
+    reuse_fig=False,
     hist=False,
     n_bins=256,
     mask=None,
@@ -281,6 +288,10 @@ def show(
             If None, generates a new figure with a single Axes instance. Otherwise, ax
             must be a 2-tuple containing the matplotlib class instances (Figure,Axes),
             with ar then plotted in the specified Axes instance.
+        reuse_fig (bool): if True and figax is None, redraws into the figure used by
+            the previous call to show with reuse_fig=True and the same figsize (if it
+            is still open), instead of creating a new figure. This is faster when
+            calling show repeatedly, e.g. in a loop, but clears the previous plot.
         hist (bool): if True, instead of plotting a 2D image in ax, plots a histogram of
             the intensity values of ar, after any scaling this function has performed.
             Plots the clipvals as dashed vertical lines
@@ -310,6 +321,9 @@ def show(
         apply_hanning_window (bool)
             If True, a 2D Hann window is applied to the array before applying the FFT
         show_cbar (bool) : if True, adds cbar
+        interpolation (str or None): the interpolation passed to matplotlib. None
+            uses matplotlib's default, which antialiases downsampled images;
+            'none' skips resampling and draws large images roughly twice as fast
         **kwargs: any keywords accepted by matplotlib's ax.matshow()
 
     Returns:
@@ -497,18 +511,24 @@ def show(
     )
     if power is not None:
         scaling = "power"
+    # _mask flags the valid pixels after scaling; None means all are valid. The
+    # scaled array is only read from below, so unscaled data is not copied
     if scaling == "none":
-        _ar = ar.copy()
-        _mask = np.ones_like(_ar.data, dtype=bool)
+        _ar = ar
+        _mask = None
     elif scaling == "full":
         _ar = np.reshape(ar.ravel().argsort().argsort(), ar.shape) / (ar.size - 1)
-        _mask = np.ones_like(_ar.data, dtype=bool)
+        _mask = None
     elif scaling == "log":
         _mask = ar.data > 0.0
-        _ar = np.zeros_like(ar.data, dtype=float)
-        _ar[_mask] = np.log(ar.data[_mask])
-        _ar[~_mask] = np.nan
-        if np.all(np.isnan(_ar)):
+        _ar = np.full(ar.data.shape, np.nan)
+        if np.iscomplexobj(ar.data):
+            # complex logs can't be written into a real output by ufunc, so
+            # gather them; assigning keeps their real parts, with a warning
+            _ar[_mask] = np.log(ar.data[_mask])
+        else:
+            np.log(ar.data, out=_ar, where=_mask)
+        if not np.any(_mask):
             _ar[:, :] = 0
         if intensity_range == "absolute":
             if vmin is not None:
@@ -521,16 +541,21 @@ def show(
     elif scaling == "power":
         if power_offset is False:
             _mask = ar.data > 0.0
-            _ar = np.zeros_like(ar.data, dtype=float)
-            _ar[_mask] = np.power(ar.data[_mask], power)
-            _ar[~_mask] = np.nan
+            _ar = np.full(ar.data.shape, np.nan)
+            if np.iscomplexobj(ar.data):
+                # as for log scaling, complex powers are gathered and assigned
+                _ar[_mask] = np.power(ar.data[_mask], power)
+            else:
+                np.power(ar.data, power, out=_ar, where=_mask)
         else:
             ar_min = np.min(ar)
             if ar_min < 0:
-                _ar = np.power(ar.copy() - np.min(ar), power)
+                _ar = np.power(ar - ar_min, power)
+            elif power == 1:
+                _ar = ar
             else:
-                _ar = np.power(ar.copy(), power)
-            _mask = np.ones_like(_ar.data, dtype=bool)
+                _ar = np.power(ar, power)
+            _mask = None
             if intensity_range == "absolute":
                 if vmin is not None:
                     vmin = np.power(vmin, power)
@@ -541,7 +566,14 @@ def show(
 
     # Create the masked array applying the user mask (this is done before the
     # vmin and vmax are determined so the mask affects those)
-    _ar = np.ma.array(data=_ar.data, mask=np.logical_or(~_mask, ar.mask))
+    if _mask is None:
+        _ar = np.ma.array(data=_ar.data, mask=ar.mask)
+    else:
+        # invert the valid-pixel mask in place rather than allocating new masks
+        np.logical_not(_mask, out=_mask)
+        _mask |= ar.mask
+        _ar = np.ma.array(data=_ar.data, mask=_mask)
+    del _mask
 
     # set scaling for boolean arrays
     if _ar.dtype == "bool":
@@ -560,12 +592,12 @@ def show(
             vmin = 0.02
         if vmax is None:
             vmax = 0.98
+        valid = ~np.isnan(_ar.data)
         if masked_intensity_range:
-            vals = np.sort(
-                _ar[np.logical_and(~np.isnan(_ar), np.logical_not(_ar.mask))]
-            )
-        else:
-            vals = np.sort(_ar.data[~np.isnan(_ar)])
+            valid &= ~_ar.mask
+        vals = _ar.data[valid]
+        del valid
+        vals.sort()
         ind_vmin = np.round((vals.shape[0] - 1) * vmin).astype("int")
         ind_vmax = np.round((vals.shape[0] - 1) * vmax).astype("int")
         ind_vmin = np.max([0, ind_vmin])
@@ -577,7 +609,7 @@ def show(
             vmin = vals[0]
             vmax = vals[-1]
     elif intensity_range == "minmax":
-        vmin, vmax = np.nanmin(_ar), np.nanmax(_ar)
+        vmin, vmax = _get_min_max(_ar)
     elif intensity_range == "absolute":
         if vmin is None:
             vmin = np.min(_ar)
@@ -593,7 +625,7 @@ def show(
         # vmin,vmax = vmin,vmax
     elif intensity_range == "std":
         assert vmin is not None and vmax is not None
-        m, s = np.nanmedian(_ar), np.nanstd(_ar)
+        m, s = _get_median_std(_ar)
         vmin = m + vmin * s
         vmax = m + vmax * s
     elif intensity_range == "centered":
@@ -606,7 +638,9 @@ def show(
 
     if show_image:
         # Create or attach to the appropriate Figure and Axis
-        if figax is None:
+        if figax is None and reuse_fig:
+            fig, ax = _get_reused_figax(figsize)
+        elif figax is None:
             fig, ax = plt.subplots(1, 1, figsize=figsize)
         else:
             fig, ax = figax
@@ -622,6 +656,17 @@ def show(
 
         # Plot the image
         if not hist:
+            # the image is displayed with 8 bits per channel, so float64 data is
+            # passed to matplotlib as float32 unless the intensity range is too
+            # narrow to be resolved in single precision
+            lim = np.maximum(np.abs(vmin), np.abs(vmax))
+            if (
+                _ar.dtype == np.float64
+                and np.isfinite(lim)
+                and (vmax - vmin) > lim * 2**-12
+            ):
+                _ar = _ar.astype(np.float32)
+
             cax = ax.matshow(
                 _ar,
                 vmin=vmin,
@@ -632,8 +677,17 @@ def show(
             )
             if np.any(_ar.mask):
                 mask_display = np.ma.array(data=_ar.data, mask=~_ar.mask)
+                # matshow defaults to nearest-neighbor for the mask layer
+                mask_kwargs = (
+                    {} if interpolation is None else {"interpolation": interpolation}
+                )
                 ax.matshow(
-                    mask_display, cmap=cmap, alpha=mask_alpha, vmin=vmin, vmax=vmax
+                    mask_display,
+                    cmap=cmap,
+                    alpha=mask_alpha,
+                    vmin=vmin,
+                    vmax=vmax,
+                    **mask_kwargs,
                 )
             if show_cbar:
                 ax_divider = make_axes_locatable(ax)
@@ -655,9 +709,8 @@ def show(
 
         # Add a border
         if bordercolor is not None:
-            for s in ["bottom", "top", "left", "right"]:
-                ax.spines[s].set_color(bordercolor)
-                ax.spines[s].set_linewidth(borderwidth)
+            for spine in ax.spines.values():
+                spine.set(color=bordercolor, linewidth=borderwidth)
             ax.set_xticks([])
             ax.set_yticks([])
 
@@ -846,6 +899,124 @@ def show(
         return tuple(returnval)
 
 
+# figures reused by show(..., reuse_fig=True), keyed by figsize
+_reused_figures = {}
+
+
+def _get_reused_figax(figsize):
+    """
+    Returns a cleared (Figure,Axes) pair for figsize, reusing the figure from the
+    last call if it is still open.
+    """
+    key = tuple(figsize)
+    fig = _reused_figures.get(key)
+    if fig is None or not plt.fignum_exists(fig.number):
+        fig, ax = plt.subplots(1, 1, figsize=figsize)
+        _reused_figures[key] = fig
+    else:
+        fig.clf()
+        ax = fig.add_subplot(1, 1, 1)
+    return fig, ax
+
+
+def _get_median_std(ar, max_samples=2**16):
+    """
+    Returns the median and standard deviation of the unmasked, non-NaN values of
+    the masked array ar. For arrays with more than 2*max_samples pixels these are
+    estimated from a fixed pseudo-random sample of max_samples pixels, which is
+    ample for setting display limits.
+    """
+    data = ar.data.ravel()
+    mask = np.ma.getmaskarray(ar).ravel()
+    if data.size > 2 * max_samples:
+        inds = np.sort(np.random.default_rng(0).integers(0, data.size, max_samples))
+        m, s, n = _get_median_std_flat(data[inds], mask[inds])
+        # fall back to all pixels if too few of the sampled ones are valid
+        if n >= max_samples // 64:
+            return m, s
+    m, s, _ = _get_median_std_flat(data, mask)
+    return m, s
+
+
+def _get_median_std_flat(data, mask):
+    """
+    Returns the median, standard deviation and number of the unmasked, non-NaN
+    values of the 1D array data. With numba, the valid values are gathered and
+    summed in one pass over data, then a second pass over the gathered values
+    sums their squared deviations from the mean.
+    """
+    if njit is not None:
+        data = _as_native(data)
+    if njit is None or not _numba_supports(data.dtype):
+        vals = data[~(mask | np.isnan(data))]
+        if vals.size == 0:
+            return np.nan, np.nan, 0
+        return np.median(vals), np.std(vals), vals.size
+    vals, n, M2 = _median_std_pass(data, mask)
+    if n == 0:
+        return np.nan, np.nan, 0
+    return np.median(vals[:n], overwrite_input=True), np.sqrt(M2 / n), n
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _median_std_pass(data, mask):
+        # copies the unmasked non-NaN values for the median, summing them as they
+        # are copied, then sums their squared deviations from the mean
+        vals = np.empty(data.size, dtype=np.float64)
+        n = 0
+        total = 0.0
+        for i in range(data.size):
+            v = np.float64(data[i])
+            if mask[i] or np.isnan(v):
+                continue
+            vals[n] = v
+            n += 1
+            total += v
+        mean = total / n if n > 0 else 0.0
+        M2 = 0.0
+        for i in range(n):
+            delta = vals[i] - mean
+            M2 += delta * delta
+        return vals, n, M2
+
+
+def _get_min_max(ar):
+    """
+    Returns the minimum and maximum of the unmasked, non-NaN values of the masked
+    array ar, with a single pass over the array when numba is available.
+    """
+    data = ar.data.ravel()
+    if njit is not None and data.size > 0:
+        native = _as_native(data)
+        if _numba_supports(native.dtype):
+            lo, hi, n = _min_max_pass(native, np.ma.getmaskarray(ar).ravel())
+            if n > 0:
+                return data.dtype.type(lo), data.dtype.type(hi)
+    return np.nanmin(ar), np.nanmax(ar)
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _min_max_pass(data, mask):
+        # returns the min, max and number of the unmasked non-NaN values
+        n = 0
+        lo = data[0]
+        hi = data[0]
+        for i in range(data.size):
+            v = data[i]
+            if mask[i] or np.isnan(v):
+                continue
+            if n == 0 or v < lo:
+                lo = v
+            if n == 0 or v > hi:
+                hi = v
+            n += 1
+        return lo, hi, n
+
+
 def show_hist(
     arr,
     bins=200,
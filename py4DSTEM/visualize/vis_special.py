@@ -1253,9 +1253,8 @@ def show_strain(
     # Add borders
     if bordercolor is not None:
         for ax in (ax11, ax12, ax21, ax22):
-            for s in ["bottom", "top", "left", "right"]:
-                ax.spines[s].set_color(bordercolor)
-                ax.spines[s].set_linewidth(borderwidth)
+            for spine in ax.spines.values():
+                spine.set(color=bordercolor, linewidth=borderwidth)
             ax.set_xticks([])
             ax.set_yticks([])
 
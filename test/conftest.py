@@ -0,0 +1,31 @@
+import sys
+
+import numpy as np
+import pytest
+
+# native, big-endian and float16 dtypes, which the numba kernels either take
+# directly, take after a cast, or leave to the numpy code
+NUMBA_DTYPES = ("<f8", "<f4", "<u2", "<i4", ">u2", ">f4", ">f8", "<f2")
+
+
+@pytest.fixture(params=NUMBA_DTYPES)
+def numba_dtype(request):
+    return np.dtype(request.param)
+
+
+@pytest.fixture
+def exact_image():
+    """a float64 image whose values every dtype in NUMBA_DTYPES holds exactly"""
+    return np.random.default_rng(0).integers(0, 200, (30, 40)).astype(np.float64)
+
+
+@pytest.fixture
+def numpy_reference(monkeypatch):
+    """calls a function with the numba kernels of its module disabled"""
+
+    def call(f, *args, **kwargs):
+        with monkeypatch.context() as m:
+            m.setattr(sys.modules[f.__module__], "njit", None)
+            return f(*args, **kwargs)
+
+    return call
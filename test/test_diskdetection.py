@@ -0,0 +1,96 @@
+import py4DSTEM
+import numpy as np
+from py4DSTEM.braggvectors.diskdetection import (
+    _find_Bragg_disks_single,
+    find_Bragg_disks,
+)
+
+
+def _disk(Q, x0, y0, r=2.5):
+    xx, yy = np.meshgrid(np.arange(Q), np.arange(Q), indexing="ij")
+    return 1 / (1 + np.exp(np.hypot(xx - x0, yy - y0) - r))
+
+
+def _make_data(R_Nx=2, R_Ny=35, Q=32):
+    # a lattice of disks that drifts slowly across the scan, with noise
+    rng = np.random.default_rng(0)
+    data = np.zeros((R_Nx, R_Ny, Q, Q), dtype=np.float32)
+    for rx in range(R_Nx):
+        for ry in range(R_Ny):
+            for a in range(-1, 2):
+                for b in range(-1, 2):
+                    x = Q / 2 + a * 9.3 + 0.05 * ry
+                    y = Q / 2 + b * 8.7 + 0.1 * rx
+                    data[rx, ry] += _disk(Q, x, y) * (1 + (a * a + b * b) % 3)
+    return data + 0.05 * rng.random(data.shape).astype(np.float32)
+
+
+KWARGS = dict(
+    sigma_cc=0,
+    minPeakSpacing=4,
+    maxNumPeaks=12,
+    minRelativeIntensity=0.001,
+    edgeBoundary=2,
+)
+
+
+def test_find_Bragg_disks_batched_matches_single():
+    """batched cross correlations give the same peaks as one pattern at a time"""
+    data = _make_data()
+    probe = _disk(data.shape[-1], data.shape[-2] / 2, data.shape[-1] / 2)
+    filter_function = np.sqrt
+
+    for subpixel in ("poly", "multicorr"):
+        braggvectors = find_Bragg_disks(
+            py4DSTEM.DataCube(data=data.copy()),
+            probe,
+            subpixel=subpixel,
+            corrPower=0.5,
+            sigma_dp=1,
+            filter_function=filter_function,
+            **KWARGS,
+        )
+        stack = find_Bragg_disks(
+            data.reshape((-1,) + data.shape[-2:]),
+            probe,
+            subpixel=subpixel,
+            corrPower=0.5,
+            sigma_dp=1,
+            filter_function=filter_function,
+            **KWARGS,
+        )
+        for rx, ry in ((0, 0), (0, 31), (0, 32), (1, 34)):
+            single = _find_Bragg_disks_single(
+                data[rx, ry],
+                probe,
+                subpixel=subpixel,
+                corrPower=0.5,
+                sigma_dp=1,
+                filter_function=filter_function,
+                minPeakSpacing=4,
+                maxNumPeaks=12,
+                minRelativeIntensity=0.001,
+                edgeBoundary=2,
+                sigma_cc=0,
+            )
+            batched = braggvectors.raw[rx, ry].data
+            stacked = stack[rx * data.shape[1] + ry].data
+            assert len(single.data) > 0
+            for field in ("qx", "qy", "intensity"):
+                assert np.allclose(batched[field], single.data[field], rtol=1e-5)
+                assert np.allclose(stacked[field], single.data[field], rtol=1e-5)
+
+
+def test_find_Bragg_disks_no_template():
+    data = _make_data(R_Nx=1, R_Ny=3)
+    braggvectors = find_Bragg_disks(
+        py4DSTEM.DataCube(data=data.copy()), None, subpixel="pixel", **KWARGS
+    )
+    single = _find_Bragg_disks_single(
+        data[0, 1],
+        None,
+        subpixel="pixel",
+        sigma_cc=0,
+        **{k: v for k, v in KWARGS.items() if k != "sigma_cc"},
+    )
+    assert np.array_equal(braggvectors.raw[0, 1].data["qx"], single.data["qx"])
@@ -1,5 +1,6 @@
 import py4DSTEM
 import numpy as np
+import pytest
 
 
 def test_attach():
@@ -22,3 +23,72 @@ def test_datacube_copy():
     x = py4DSTEM.DataCube(data=np.zeros((3, 3, 4, 4)))
     y = x.copy()
     assert isinstance(y, py4DSTEM.DataCube)
+
+
+def test_add_to_2D_array_from_floats():
+    """tests that values at repeated coordinates are all added"""
+    from py4DSTEM.process.utils import add_to_2D_array_from_floats
+
+    ar = np.zeros((4, 4))
+    x = np.array([1.5, 1.5, 10.0])
+    y = np.array([2.0, 2.0, 1.0])
+    I = np.array([1.0, 3.0, 5.0])
+    add_to_2D_array_from_floats(ar, x, y, I)
+
+    assert ar.sum() == 4.0
+    assert ar[1, 2] == 2.0
+    assert ar[2, 2] == 2.0
+
+
+@pytest.mark.parametrize("I_dtype", ["<f8", ">f8", "<f2", "<i4"])
+def test_add_to_2D_array_from_floats_dtypes(numba_dtype, I_dtype, numpy_reference):
+    """tests that values are added as by the numpy path for any dtype"""
+    from py4DSTEM.process.utils import add_to_2D_array_from_floats
+
+    x = np.array([1.5, 1.5, 0.25])
+    y = np.array([2.0, 2.0, 1.0])
+    I = np.array([1.0, 3.0, 4.0]).astype(I_dtype)
+    if numba_dtype.kind != "f":
+        # the fractional weights can't be added to integer arrays
+        with pytest.raises(TypeError):
+            add_to_2D_array_from_floats(np.zeros((4, 4), numba_dtype), x, y, I)
+        return
+    expected = numpy_reference(
+        add_to_2D_array_from_floats, np.zeros((4, 4), numba_dtype), x, y, I
+    )
+    ar = add_to_2D_array_from_floats(np.zeros((4, 4), numba_dtype), x, y, I)
+    assert ar.dtype == numba_dtype
+    assert np.array_equal(ar, expected)
+    assert ar.sum() == 8.0
+
+
+@pytest.mark.parametrize("corner_centered", [False, True])
+def test_get_CoM_dtypes(numba_dtype, corner_centered, exact_image, numpy_reference):
+    """tests that the center of mass matches the numpy path for any dtype"""
+    from py4DSTEM.process.utils import get_CoM
+
+    expected = numpy_reference(get_CoM, exact_image, corner_centered=corner_centered)
+    CoM = get_CoM(exact_image.astype(numba_dtype), corner_centered=corner_centered)
+    assert np.allclose(CoM, expected)
+
+
+def test_get_CoM_complex():
+    """tests that complex arrays use the numpy path"""
+    from py4DSTEM.process.utils import get_CoM
+
+    ar = np.zeros((5, 5), dtype=np.complex64)
+    ar[1, 3] = 2
+    assert np.allclose(get_CoM(ar), (1, 3))
+
+
+def test_get_cross_correlation_numpy_fft_equivalence():
+    """tests that cross correlations match the numpy FFT formula"""
+    from py4DSTEM.process.utils.cross_correlate import get_cross_correlation
+
+    rng = np.random.default_rng(0)
+    ar, template = rng.random((2, 24, 18))
+    for corrPower in (1, 0.5, 0):
+        m = np.fft.fft2(ar) * np.conj(np.fft.fft2(template))
+        cc = np.abs(m) ** corrPower * np.exp(1j * np.angle(m))
+        expected = np.maximum(np.real(np.fft.ifft2(cc)), 0)
+        assert np.allclose(get_cross_correlation(ar, template, corrPower), expected)
@@ -0,0 +1,27 @@
+import numpy as np
+from scipy.fft import fft2
+from py4DSTEM.process.utils.multicorr import (
+    upsampled_correlation,
+    upsampled_correlation_batch,
+)
+
+
+def test_upsampled_correlation_batch_matches_single():
+    """batched DFT upsampling refines each peak as the single-peak version does"""
+    rng = np.random.default_rng(0)
+    Q = 48
+    xx, yy = np.meshgrid(np.arange(Q), np.arange(Q), indexing="ij")
+    centers = [(10.3, 12.7), (30.6, 8.2), (25.0, 33.5), (40.45, 40.1), (2.2, 45.6)]
+    image = sum(np.exp(-((xx - x) ** 2 + (yy - y) ** 2) / 4) for x, y in centers)
+    image += 0.01 * rng.random(image.shape)
+    imageCorr = fft2(image)
+
+    # half pixel guesses, as get_maxima_2D passes them
+    xyShifts = np.round(np.array(centers) * 2) / 2
+    # guesses a pixel away from a peak put the maximum on the upsampled edge
+    xyShifts = np.concatenate((xyShifts, xyShifts[:2] + 1))
+    for upsampleFactor in (4, 16):
+        batch = upsampled_correlation_batch(imageCorr, upsampleFactor, xyShifts)
+        for xyShift, refined in zip(xyShifts, batch):
+            single = upsampled_correlation(imageCorr, upsampleFactor, xyShift)
+            assert np.allclose(refined, single)
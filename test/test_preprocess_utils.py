@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from py4DSTEM.preprocess.utils import bin2D, get_maxima_2D, make_Fourier_coords2D
+
+
+@pytest.mark.parametrize("subpixel", ["pixel", "poly"])
+def test_get_maxima_2D_dtypes(numba_dtype, subpixel, exact_image):
+    """maxima do not depend on the byte order or precision of the input"""
+    kwargs = dict(minSpacing=2, edgeBoundary=2, maxNumPeaks=20)
+    expected = get_maxima_2D(exact_image, subpixel=subpixel, **kwargs)
+    maxima = get_maxima_2D(exact_image.astype(numba_dtype), subpixel=subpixel, **kwargs)
+    assert len(expected) == 20
+    for field in ("x", "y", "intensity"):
+        assert np.allclose(maxima[field], expected[field])
+
+
+@pytest.mark.parametrize("out_dtype", [np.float64, np.float32, np.float16])
+def test_bin2D_dtypes(numba_dtype, out_dtype, exact_image, numpy_reference):
+    """binning matches the numpy path, for any input byte order and precision"""
+    ar = exact_image[:29, :38]
+    expected = numpy_reference(bin2D, ar.astype(numba_dtype), 3, dtype=out_dtype)
+    assert np.allclose(expected, ar[:27, :36].reshape(9, 3, 12, 3).sum(axis=(1, 3)))
+    binned = bin2D(ar.astype(numba_dtype), 3, dtype=out_dtype)
+    assert binned.dtype == out_dtype
+    assert np.array_equal(binned, expected)
+
+
+def test_make_Fourier_coords2D():
+    qx, qy = make_Fourier_coords2D(5, 8, (0.5, 2))
+    qy_expected, qx_expected = np.meshgrid(np.fft.fftfreq(8, 2), np.fft.fftfreq(5, 0.5))
+    assert np.array_equal(qx, qx_expected)
+    assert np.array_equal(qy, qy_expected)
+
+
+def test_get_shifted_ar_numpy_fft_equivalence():
+    """Fourier shifts match the full complex numpy FFT shift for any size"""
+    from py4DSTEM.preprocess.utils import get_shifted_ar
+
+    rng = np.random.default_rng(0)
+    for shape in ((16, 20), (15, 20), (16, 21), (15, 21)):
+        ar = rng.random(shape)
+        for xshift, yshift in ((2.3, -1.7), (0.5, 0.5), (-3, 4)):
+            qy, qx = np.meshgrid(np.fft.fftfreq(shape[1]), np.fft.fftfreq(shape[0]))
+            w = np.exp(-(2j * np.pi) * ((yshift * qy) + (xshift * qx)))
+            expected = np.real(np.fft.ifft2(np.fft.fft2(ar) * w))
+            for dtype in (np.float64, np.float32, np.complex128):
+                shifted = get_shifted_ar(ar.astype(dtype), xshift, yshift)
+                assert np.allclose(shifted, expected, atol=1e-5)
@@ -0,0 +1,187 @@
+import py4DSTEM
+import numpy as np
+import pytest
+from py4DSTEM.process.phase import PtychographicTomography
+
+
+def _make_tomography(num_tilts=2):
+    rng = np.random.default_rng(0)
+    datacubes = []
+    for _ in range(num_tilts):
+        datacube = py4DSTEM.DataCube(
+            data=rng.random((4, 4, 16, 16)).astype(np.float32) + 1
+        )
+        datacube.calibration.set_R_pixel_size(1.0)
+        datacube.calibration.set_R_pixel_units("A")
+        datacube.calibration.set_Q_pixel_size(0.05)
+        datacube.calibration.set_Q_pixel_units("A^-1")
+        datacubes.append(datacube)
+
+    tomo = PtychographicTomography(
+        energy=300e3,
+        num_slices=4,
+        tilt_orientation_matrices=[np.eye(3)] * num_tilts,
+        datacube=datacubes,
+        semiangle_cutoff=20,
+        device="cpu",
+        verbose=False,
+    )
+    return tomo.preprocess(
+        plot_probe_overlaps=False,
+        progress_bar=False,
+        diffraction_patterns_rotate_degrees=0,
+        diffraction_patterns_transpose=False,
+    )
+
+
+def test_reconstruct_store_iterations_memmap_twice(tmp_path):
+    """stored iterations from a previous call are kept in their own file"""
+    path = str(tmp_path / "object_iterations.npy")
+    tomo = _make_tomography()
+
+    tomo.reconstruct(
+        num_iter=2,
+        store_iterations=True,
+        store_iterations_path=path,
+        progress_bar=False,
+    )
+    first = [np.array(obj) for obj in tomo.object_iterations]
+
+    tomo.reconstruct(
+        num_iter=2,
+        store_iterations=True,
+        store_iterations_path=path,
+        progress_bar=False,
+    )
+
+    assert len(tomo.object_iterations) == 4
+    for obj, obj_first in zip(tomo.object_iterations[:2], first):
+        assert np.array_equal(obj, obj_first)
+    assert not np.array_equal(tomo.object_iterations[3], first[1])
+
+    stored = np.concatenate(
+        (np.load(path), np.load(str(tmp_path / "object_iterations_1.npy")))
+    )
+    assert stored.shape[0] == 4
+    for obj, obj_stored in zip(tomo.object_iterations, stored):
+        assert np.array_equal(obj, obj_stored)
+
+
+def test_reconstruct_store_iterations_memmap_interrupted(tmp_path):
+    """an interrupted run's file lists only the iterations written"""
+    path = str(tmp_path / "object_iterations.npy")
+    tomo = _make_tomography()
+
+    store_object_iteration = tomo._store_object_iteration
+
+    def interrupt_third_iteration():
+        if len(tomo.object_iterations) == 2:
+            raise KeyboardInterrupt
+        store_object_iteration()
+
+    tomo._store_object_iteration = interrupt_third_iteration
+    with pytest.raises(KeyboardInterrupt):
+        tomo.reconstruct(
+            num_iter=4,
+            store_iterations=True,
+            store_iterations_path=path,
+            progress_bar=False,
+        )
+
+    stored = np.load(path)
+    assert stored.shape[0] == 2
+    for obj, obj_stored in zip(tomo.object_iterations, stored):
+        assert np.array_equal(obj, obj_stored)
+    assert np.load(path, mmap_mode="r").shape == stored.shape
+
+
+def test_reconstruct_store_iterations_memmap_matches_memory(tmp_path):
+    path = str(tmp_path / "object_iterations.npy")
+    # tilts are shuffled with the global numpy RNG
+    np.random.seed(0)
+    tomo = _make_tomography()
+    tomo.reconstruct(num_iter=3, store_iterations=True, progress_bar=False)
+    in_memory = [np.array(obj) for obj in tomo.object_iterations]
+
+    np.random.seed(0)
+    tomo = _make_tomography()
+    tomo.reconstruct(
+        num_iter=3,
+        store_iterations=True,
+        store_iterations_path=path,
+        progress_bar=False,
+    )
+
+    assert len(tomo.object_iterations) == 3
+    # separate runs agree only to float32 round-off
+    for obj, obj_memory in zip(tomo.object_iterations, in_memory):
+        assert np.allclose(obj, obj_memory, rtol=1e-4, atol=1e-12)
+
+
+def test_rotate_zxy_volume_fourier_shear():
+    """three-shear rotations match spline rotations of a smooth volume"""
+    from scipy.spatial.transform import Rotation
+
+    tomo = _make_tomography()
+    n = 32
+    z, x, y = np.meshgrid(*(np.arange(n) - (n - 1) / 2,) * 3, indexing="ij")
+    volume = np.exp(-((z - 3) ** 2 / 8 + (x + 2) ** 2 / 18 + (y - 4) ** 2 / 5))
+    volume = volume.astype(np.float32)
+
+    for axis in "xyz":
+        for degrees in (20, -55, 90):
+            rot_matrix = Rotation.from_euler(axis, degrees, degrees=True).as_matrix()
+            spline = tomo._rotate_zxy_volume(volume, rot_matrix, method="spline")
+            shear = tomo._rotate_zxy_volume(volume, rot_matrix, method="fourier-shear")
+            assert shear.dtype == volume.dtype
+            assert np.allclose(shear, spline, atol=5e-3)
+
+    # rotations about more than one axis fall back to the spline path
+    rot_matrix = Rotation.from_euler("xz", (20, 30), degrees=True).as_matrix()
+    assert np.array_equal(
+        tomo._rotate_zxy_volume(volume, rot_matrix, method="fourier-shear"),
+        tomo._rotate_zxy_volume(volume, rot_matrix, method="spline"),
+    )
+
+
+def test_add_expanded_sliced_object():
+    """in-place expansion matches expanding and adding"""
+    tomo = _make_tomography()
+    rng = np.random.default_rng(0)
+    for output_z, input_z in ((12, 4), (10, 4), (7, 3), (5, 5), (9, 2), (4, 1)):
+        array = rng.random((output_z, 6, 5)).astype(np.float32)
+        sliced_array = rng.random((input_z, 6, 5)).astype(np.float32)
+        expected = array + tomo._expand_sliced_object(sliced_array, output_z)
+        result = tomo._add_expanded_sliced_object(array, sliced_array)
+        assert result is array
+        assert np.allclose(result, expected)
+
+
+def test_reconstruct_non_collective_updates(monkeypatch):
+    """sequential updates from overlapping positions match expanding and adding"""
+
+    def expand_and_add(self, array, sliced_array):
+        array += self._expand_sliced_object(sliced_array, array.shape[0])
+        return array
+
+    objects = []
+    for add in (None, expand_and_add):
+        if add is not None:
+            monkeypatch.setattr(
+                PtychographicTomography, "_add_expanded_sliced_object", add
+            )
+        # tilts are shuffled with the global numpy RNG
+        np.random.seed(0)
+        tomo = _make_tomography()
+        assert tomo._num_slices > 1
+        tomo.reconstruct(
+            num_iter=2,
+            collective_measurement_updates=False,
+            progress_bar=False,
+        )
+        objects.append(tomo.object)
+
+    # the two paths sum in different orders, so small voxels differ by float32
+    # round-off relative to the largest ones
+    atol = 1e-5 * np.abs(objects[1]).max()
+    assert np.allclose(objects[0], objects[1], rtol=1e-4, atol=atol)
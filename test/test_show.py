@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from py4DSTEM.visualize.show import _get_median_std, _get_min_max
+
+
+def _masked_image(image):
+    ar = image.copy()
+    if ar.dtype.kind == "f":
+        ar[3, 4] = np.nan
+    mask = np.zeros(ar.shape, dtype=bool)
+    mask[10:20, 5:15] = True
+    return np.ma.array(ar, mask=mask)
+
+
+def test_get_median_std_numpy_equivalence(numba_dtype, exact_image, numpy_reference):
+    """display limits match the numpy path for native and non-native dtypes"""
+    ar = _masked_image(exact_image.astype(numba_dtype))
+    m, s = _get_median_std(ar)
+    m_np, s_np = numpy_reference(_get_median_std, ar.astype(np.float64))
+    assert np.isclose(m, m_np)
+    assert np.isclose(s, s_np)
+
+
+def test_get_min_max_numpy_equivalence(numba_dtype, exact_image, numpy_reference):
+    ar = _masked_image(exact_image.astype(numba_dtype))
+    lo, hi = _get_min_max(ar)
+    assert (lo, hi) == numpy_reference(_get_min_max, ar)
+    assert type(lo) is numba_dtype.type
+
+
+def test_show_log_complex():
+    """log scaling of complex arrays keeps the real part of the log"""
+    import matplotlib.pyplot as plt
+    import py4DSTEM
+
+    rng = np.random.default_rng(0)
+    ar = rng.random((20, 20)) + 1j * rng.random((20, 20)) - 0.3
+    with pytest.warns(np.ComplexWarning):
+        fig, ax = py4DSTEM.show(
+            ar, scaling="log", intensity_range="minmax", returnfig=True
+        )
+    valid = ar > 0
+    expected = np.log(np.abs(ar[valid]))
+    assert np.allclose(ax.images[0].get_clim(), (expected.min(), expected.max()))
+    plt.close(fig)
+
+
+@pytest.mark.parametrize("intensity_range", ["minmax", "ordered"])
+def test_show_power_complex(intensity_range):
+    """power scaling of complex arrays keeps the real part of the power"""
+    import matplotlib.pyplot as plt
+    import py4DSTEM
+
+    rng = np.random.default_rng(0)
+    ar = rng.random((20, 20)) + 1j * rng.random((20, 20)) - 0.3
+    with pytest.warns(np.ComplexWarning):
+        fig, ax = py4DSTEM.show(
+            ar,
+            intensity_range=intensity_range,
+            power=0.5,
+            power_offset=False,
+            returnfig=True,
+        )
+    expected = np.sort(np.real(np.power(ar[ar > 0], 0.5)))
+    vmin, vmax = ax.images[0].get_clim()
+    if intensity_range == "minmax":
+        assert np.allclose((vmin, vmax), (expected[0], expected[-1]))
+    else:
+        n = len(expected) - 1
+        assert np.allclose(
+            (vmin, vmax), (expected[round(0.02 * n)], expected[round(0.98 * n)])
+        )
+    plt.close(fig)
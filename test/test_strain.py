@@ -1,8 +1,10 @@
 import py4DSTEM
 from py4DSTEM import StrainMap
+from py4DSTEM.process.strain import index_peaks_to_lattice
 from os.path import join
 from numpy import zeros
-
+import numpy as np
+import pytest
 
 # set filepath
 path = join(py4DSTEM._TESTPATH, "strain/downsample_Si_SiGe_analysis_braggdisks_cal.h5")
@@ -25,3 +27,117 @@ class TestStrainMap:
         assert isinstance(strainmap, StrainMap)
         assert strainmap.calibration is not None
         assert strainmap.calibration is strainmap.braggvectors.calibration
+
+
+def test_index_peaks_to_lattice():
+    lattice_qx = np.array([0.0, 10.0, 0.0])
+    lattice_qy = np.array([0.0, 0.0, 10.0])
+    qx = np.array([0.5, 9.0, 1.0, 5.0])
+    qy = np.array([-0.5, 0.5, 11.0, 5.0])
+
+    inds = index_peaks_to_lattice(qx, qy, lattice_qx, lattice_qy, 2)
+
+    assert np.array_equal(inds, [0, 1, 2, -1])
+
+
+def test_index_peaks_to_lattice_numpy_equivalence(monkeypatch):
+    from py4DSTEM.process.strain import latticevectors
+
+    rng = np.random.default_rng(0)
+    lattice_qx, lattice_qy = rng.uniform(-50, 50, (2, 20))
+    qx, qy = rng.uniform(-60, 60, (2, 500))
+
+    inds = index_peaks_to_lattice(qx, qy, lattice_qx, lattice_qy, 5)
+    inds_swapped = index_peaks_to_lattice(
+        qx.astype(">f8"), qy.astype(">f8"), lattice_qx, lattice_qy, 5
+    )
+    monkeypatch.setattr(latticevectors, "njit", None)
+    inds_numpy = index_peaks_to_lattice(qx, qy, lattice_qx, lattice_qy, 5)
+
+    assert np.array_equal(inds, inds_numpy)
+    assert np.array_equal(inds, inds_swapped)
+    assert np.any(inds == -1) and np.any(inds >= 0)
+
+
+def test_add_indices_to_braggvectors():
+    """peaks indexed in one batch match indexing each pattern separately"""
+    from emdfile import PointList
+    from py4DSTEM import BraggVectors
+    from py4DSTEM.process.strain.latticevectors import add_indices_to_braggvectors
+
+    rng = np.random.default_rng(0)
+    braggvectors = BraggVectors(Rshape=(3, 4), Qshape=(64, 64))
+    for rx in range(3):
+        for ry in range(4):
+            # including patterns with no peaks
+            n = rng.integers(0, 8)
+            data = np.zeros(n, dtype=braggvectors._v_uncal.dtype)
+            data["qx"], data["qy"], data["intensity"] = rng.uniform(0, 64, (3, n))
+            braggvectors._v_uncal[rx, ry].add(data)
+    braggvectors.calibration.set_origin((np.full((3, 4), 32.0), np.full((3, 4), 31.0)))
+    braggvectors.setcal()
+
+    g1_ind, g2_ind = np.meshgrid(np.arange(-3, 4), np.arange(-3, 4))
+    lattice = np.zeros(
+        g1_ind.size,
+        dtype=[("qx", float), ("qy", float), ("g1_ind", int), ("g2_ind", int)],
+    )
+    lattice["g1_ind"], lattice["g2_ind"] = g1_ind.ravel(), g2_ind.ravel()
+    lattice["qx"] = 9 * lattice["g1_ind"] + 2 * lattice["g2_ind"]
+    lattice["qy"] = -1 * lattice["g1_ind"] + 8 * lattice["g2_ind"]
+    lattice = PointList(data=lattice)
+
+    mask = np.ones((3, 4), dtype=bool)
+    mask[1, 2] = False
+    indexed = add_indices_to_braggvectors(
+        braggvectors, lattice, 3, qx_shift=0.5, mask=mask
+    )
+
+    num_indexed = 0
+    for rx in range(3):
+        for ry in range(4):
+            peaks = indexed[rx, ry].data
+            if not mask[rx, ry]:
+                assert len(peaks) == 0
+                continue
+            data = braggvectors.get_vectors(
+                rx, ry, center=True, ellipse=False, rotate=False, pixel=False
+            ).data
+            inds = index_peaks_to_lattice(
+                data["qx"] + 0.5, data["qy"], lattice.data["qx"], lattice.data["qy"], 3
+            )
+            keep = inds >= 0
+            assert np.array_equal(peaks["qx"], data["qx"][keep])
+            assert np.array_equal(peaks["intensity"], data["intensity"][keep])
+            assert np.array_equal(peaks["g1_ind"], lattice.data["g1_ind"][inds[keep]])
+            assert np.array_equal(peaks["g2_ind"], lattice.data["g2_ind"][inds[keep]])
+            num_indexed += keep.sum()
+    assert num_indexed > 0
+
+    # nothing to index
+    indexed = add_indices_to_braggvectors(
+        braggvectors, lattice, 3, mask=np.zeros((3, 4), dtype=bool)
+    )
+    assert all(len(indexed[rx, ry].data) == 0 for rx in range(3) for ry in range(4))
+
+
+@pytest.mark.parametrize("num_peaks", [1, 2])
+def test_choose_basis_vectors_too_few_maxima(num_peaks):
+    """guessing the lattice vectors needs an origin, g1 and g2"""
+    from py4DSTEM import BraggVectors
+
+    braggvectors = BraggVectors(Rshape=(2, 2), Qshape=(64, 64))
+    for rx in range(2):
+        for ry in range(2):
+            data = np.zeros(num_peaks, dtype=braggvectors._v_uncal.dtype)
+            data["qx"] = [32.0, 44.0][:num_peaks]
+            data["qy"] = 32.0
+            data["intensity"] = 1.0
+            braggvectors._v_uncal[rx, ry].add(data)
+    braggvectors.calibration.set_origin((np.full((2, 2), 32.0), np.full((2, 2), 32.0)))
+    braggvectors.setcal()
+    with pytest.warns(UserWarning):
+        strainmap = StrainMap(braggvectors=braggvectors)
+
+    with pytest.raises(ValueError, match="At least three maxima"):
+        strainmap.choose_basis_vectors(subpixel="pixel")
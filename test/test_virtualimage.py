@@ -0,0 +1,37 @@
+import py4DSTEM
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("mode", ["mask", "annular"])
+def test_virtual_image_dtypes(numba_dtype, mode, exact_image, numpy_reference):
+    """virtual images match the numpy path for native and non-native dtypes"""
+    data = exact_image.reshape(3, 4, 10, 10)
+    if mode == "mask":
+        geometry = np.zeros((10, 10))
+        geometry[2:7, 3:9] = np.random.default_rng(0).random((5, 6))
+    else:
+        geometry = ((5, 4), (1, 4))
+    kwargs = dict(mode=mode, geometry=geometry, verbose=False)
+
+    datacube = py4DSTEM.DataCube(data=data.astype(numba_dtype))
+    virtual_image = datacube.get_virtual_image(**kwargs)
+    reference = py4DSTEM.DataCube(data=data)
+    expected = numpy_reference(reference.get_virtual_image, **kwargs)
+    assert np.allclose(virtual_image.data, expected.data)
+
+    mask = datacube.get_virtual_image(**kwargs, return_mask=True)
+    assert np.allclose(virtual_image.data, np.sum(data * mask, axis=(-2, -1)))
+
+
+def test_virtual_image_complex_data(exact_image):
+    """complex data with a real mask keeps the real part of the sum"""
+    data = exact_image.reshape(3, 4, 10, 10) * (1 + 1j)
+    datacube = py4DSTEM.DataCube(data=data)
+    mask = np.zeros((10, 10))
+    mask[2:7, 3:9] = 0.5
+    with pytest.warns(np.ComplexWarning):
+        virtual_image = datacube.get_virtual_image(
+            mode="mask", geometry=mask, verbose=False
+        )
+    assert np.allclose(virtual_image.data, np.sum(data.real * mask, axis=(-2, -1)))